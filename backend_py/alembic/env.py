@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from config import settings
-from db.database import Base
+from db.database import Base, get_async_database_url
 
 # this is the Alembic Config object
 config = context.config
@@ -44,7 +44,7 @@ async def run_async_migrations() -> None:
     and associate a connection with the context."""
 
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = settings.DATABASE_URL
+    configuration["sqlalchemy.url"] = get_async_database_url()
     connectable = async_engine_from_config(
         configuration,
         prefix="sqlalchemy.",
@@ -0,0 +1,92 @@
+"""Add workspace-scoped composite indexes for hot query paths.
+
+Revision ID: 002_workspace_indexes
+Revises: 001_initial
+Create Date: 2026-10-17 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002_workspace_indexes'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - kept in sync with __table_args__ in db/models.py
+INDEXES = [
+    ('ix_users_workspace_id', 'users', ['workspace_id']),
+
+    ('ix_contacts_workspace_id_type', 'contacts', ['workspace_id', 'type']),
+    ('ix_contacts_workspace_id_created_at', 'contacts', ['workspace_id', 'created_at']),
+    ('ix_contacts_workspace_id_email', 'contacts', ['workspace_id', 'email']),
+    ('ix_contacts_created_by', 'contacts', ['created_by']),
+
+    ('ix_tasks_workspace_id_status_due_date', 'tasks', ['workspace_id', 'status', 'due_date']),
+    ('ix_tasks_workspace_id_priority_due_date', 'tasks', ['workspace_id', 'priority', 'due_date']),
+    ('ix_tasks_workspace_id_assigned_to_due_date', 'tasks', ['workspace_id', 'assigned_to', 'due_date']),
+    ('ix_tasks_workspace_id_due_date', 'tasks', ['workspace_id', 'due_date']),
+    ('ix_tasks_workspace_id_created_at', 'tasks', ['workspace_id', 'created_at']),
+    ('ix_tasks_assigned_to', 'tasks', ['assigned_to']),
+    ('ix_tasks_contact_id', 'tasks', ['contact_id']),
+    ('ix_tasks_deal_id', 'tasks', ['deal_id']),
+
+    ('ix_deals_workspace_id_stage_updated_at', 'deals', ['workspace_id', 'stage', 'updated_at']),
+    ('ix_deals_workspace_id_updated_at', 'deals', ['workspace_id', 'updated_at']),
+    ('ix_deals_contact_id_updated_at', 'deals', ['contact_id', 'updated_at']),
+    ('ix_deals_assigned_to', 'deals', ['assigned_to']),
+    ('ix_deals_created_by', 'deals', ['created_by']),
+
+    ('ix_interactions_contact_id_interaction_date', 'interactions', ['contact_id', 'interaction_date']),
+    ('ix_interactions_user_id', 'interactions', ['user_id']),
+
+    ('ix_notes_workspace_id_created_at', 'notes', ['workspace_id', 'created_at']),
+    ('ix_notes_contact_id_created_at', 'notes', ['contact_id', 'created_at']),
+    ('ix_notes_deal_id_created_at', 'notes', ['deal_id', 'created_at']),
+    ('ix_notes_user_id_created_at', 'notes', ['user_id', 'created_at']),
+
+    ('ix_tags_workspace_id_name', 'tags', ['workspace_id', 'name']),
+
+    ('ix_contact_tags_contact_id_tag_id', 'contact_tags', ['contact_id', 'tag_id']),
+    ('ix_contact_tags_tag_id', 'contact_tags', ['tag_id']),
+
+    ('ix_ai_suggestions_workspace_id_created_at', 'ai_suggestions', ['workspace_id', 'created_at']),
+    ('ix_ai_suggestions_user_id', 'ai_suggestions', ['user_id']),
+]
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # Notes are queried by workspace but had no workspace_id; backfill it
+    # from the owning contact or deal.
+    with op.batch_alter_table('notes') as batch_op:
+        batch_op.add_column(sa.Column('workspace_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_notes_workspace_id_workspaces', 'workspaces', ['workspace_id'], ['id']
+        )
+    op.execute("""
+        UPDATE notes SET workspace_id = COALESCE(
+            (SELECT contacts.workspace_id FROM contacts WHERE contacts.id = notes.contact_id),
+            (SELECT deals.workspace_id FROM deals WHERE deals.id = notes.deal_id)
+        )
+    """)
+
+    # 001 created contact_tags with a free-text tag column; the model links
+    # to tags.id instead.
+    contact_tag_columns = {c['name'] for c in inspector.get_columns('contact_tags')}
+    if 'tag_id' not in contact_tag_columns:
+        with op.batch_alter_table('contact_tags') as batch_op:
+            batch_op.add_column(sa.Column('tag_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_contact_tags_tag_id_tags', 'tags', ['tag_id'], ['id']
+            )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('notes') as batch_op:
+        batch_op.drop_constraint('fk_notes_workspace_id_workspaces', type_='foreignkey')
+        batch_op.drop_column('workspace_id')
@@ -0,0 +1,22 @@
+"""Add full-text search indexes for contacts and notes.
+
+Revision ID: 003_full_text_search
+Revises: 002_workspace_indexes
+Create Date: 2026-10-17 10:00:00.000000
+"""
+from alembic import op
+
+from db.search import install_full_text_search, drop_full_text_search
+
+revision = '003_full_text_search'
+down_revision = '002_workspace_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Postgres: generated tsvector columns + GIN indexes
+    # SQLite: FTS5 external-content tables + sync triggers
+    install_full_text_search(op.get_bind())
+
+def downgrade() -> None:
+    drop_full_text_search(op.get_bind())
@@ -0,0 +1,55 @@
+"""Make tag names unique per workspace and contact tag links unique.
+
+Revision ID: 004_unique_tags
+Revises: 003_full_text_search
+Create Date: 2026-10-17 11:00:00.000000
+"""
+from alembic import op
+
+revision = '004_unique_tags'
+down_revision = '003_full_text_search'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Concurrent tag updates could create the same tag twice. Point links at
+    # the oldest copy of each (workspace_id, name) and drop the rest.
+    op.execute("""
+        UPDATE contact_tags SET tag_id = COALESCE((
+            SELECT MIN(keeper.id) FROM tags AS dup
+            JOIN tags AS keeper
+              ON keeper.workspace_id = dup.workspace_id AND keeper.name = dup.name
+            WHERE dup.id = contact_tags.tag_id
+        ), tag_id)
+        WHERE tag_id IS NOT NULL
+    """)
+    op.execute("""
+        DELETE FROM tags
+        WHERE workspace_id IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM tags GROUP BY workspace_id, name)
+    """)
+
+    # contact_tags has no primary key; rebuild the linked rows without duplicates
+    op.execute("""
+        CREATE TABLE contact_tags_dedup AS
+        SELECT DISTINCT contact_id, tag_id FROM contact_tags WHERE tag_id IS NOT NULL
+    """)
+    op.execute("DELETE FROM contact_tags WHERE tag_id IS NOT NULL")
+    op.execute("""
+        INSERT INTO contact_tags (contact_id, tag_id)
+        SELECT contact_id, tag_id FROM contact_tags_dedup
+    """)
+    op.drop_table('contact_tags_dedup')
+
+    op.drop_index('ix_tags_workspace_id_name', table_name='tags')
+    op.create_index('uq_tags_workspace_id_name', 'tags', ['workspace_id', 'name'], unique=True)
+    op.drop_index('ix_contact_tags_contact_id_tag_id', table_name='contact_tags')
+    op.create_index(
+        'uq_contact_tags_contact_id_tag_id', 'contact_tags', ['contact_id', 'tag_id'], unique=True
+    )
+
+def downgrade() -> None:
+    op.drop_index('uq_contact_tags_contact_id_tag_id', table_name='contact_tags')
+    op.create_index('ix_contact_tags_contact_id_tag_id', 'contact_tags', ['contact_id', 'tag_id'])
+    op.drop_index('uq_tags_workspace_id_name', table_name='tags')
+    op.create_index('ix_tags_workspace_id_name', 'tags', ['workspace_id', 'name'])
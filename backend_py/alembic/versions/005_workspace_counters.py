@@ -0,0 +1,62 @@
+"""Add per-workspace dashboard counters.
+
+Revision ID: 005_workspace_counters
+Revises: 004_unique_tags
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005_workspace_counters'
+down_revision = '004_unique_tags'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'workspace_counters',
+        sa.Column('workspace_id', sa.Integer(), sa.ForeignKey('workspaces.id'), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('workspace_id', 'name')
+    )
+
+    # Backfill with the same counters services.crud.counters maintains.
+    # Enum columns store member names (TODO, CLOSED_WON); counters use values.
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'tasks.total', COUNT(*) FROM tasks
+        WHERE workspace_id IS NOT NULL GROUP BY workspace_id
+    """)
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'tasks.status.' || LOWER(status), COUNT(*) FROM tasks
+        WHERE workspace_id IS NOT NULL AND status IS NOT NULL GROUP BY workspace_id, status
+    """)
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'tasks.priority.' || LOWER(priority), COUNT(*) FROM tasks
+        WHERE workspace_id IS NOT NULL AND priority IS NOT NULL GROUP BY workspace_id, priority
+    """)
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'tasks.open_due.' || CAST(DATE(due_date) AS VARCHAR(10)), COUNT(*)
+        FROM tasks
+        WHERE workspace_id IS NOT NULL AND status IS NOT NULL AND status != 'COMPLETED'
+          AND due_date IS NOT NULL
+        GROUP BY workspace_id, DATE(due_date)
+    """)
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'deals.stage.' || LOWER(stage) || '.count', COUNT(*) FROM deals
+        WHERE workspace_id IS NOT NULL AND stage IS NOT NULL GROUP BY workspace_id, stage
+    """)
+    op.execute("""
+        INSERT INTO workspace_counters (workspace_id, name, value)
+        SELECT workspace_id, 'deals.stage.' || LOWER(stage) || '.value', SUM(value) FROM deals
+        WHERE workspace_id IS NOT NULL AND stage IS NOT NULL AND value IS NOT NULL
+        GROUP BY workspace_id, stage
+    """)
+
+def downgrade() -> None:
+    op.drop_table('workspace_counters')
@@ -0,0 +1,37 @@
+"""Add background AI job records.
+
+Revision ID: 006_ai_jobs
+Revises: 005_workspace_counters
+Create Date: 2026-10-17 13:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006_ai_jobs'
+down_revision = '005_workspace_counters'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('workspace_id', sa.Integer(), sa.ForeignKey('workspaces.id'), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_jobs_status_created_at', 'ai_jobs', ['status', 'created_at'])
+    op.create_index('ix_ai_jobs_workspace_id_created_at', 'ai_jobs', ['workspace_id', 'created_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_jobs_workspace_id_created_at', table_name='ai_jobs')
+    op.drop_index('ix_ai_jobs_status_created_at', table_name='ai_jobs')
+    op.drop_table('ai_jobs')
@@ -0,0 +1,34 @@
+"""Add the persistent AI response cache.
+
+Revision ID: 007_ai_response_cache
+Revises: 006_ai_jobs
+Create Date: 2026-10-17 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007_ai_response_cache'
+down_revision = '006_ai_jobs'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_response_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=True),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_ai_response_cache_cache_key', 'ai_response_cache', ['cache_key'], unique=True
+    )
+    op.create_index('ix_ai_response_cache_expires_at', 'ai_response_cache', ['expires_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_response_cache_expires_at', table_name='ai_response_cache')
+    op.drop_index('uq_ai_response_cache_cache_key', table_name='ai_response_cache')
+    op.drop_table('ai_response_cache')
@@ -0,0 +1,20 @@
+"""Record which note content the stored AI analysis was made from.
+
+Revision ID: 008_note_analysis_hash
+Revises: 007_ai_response_cache
+Create Date: 2026-10-17 15:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008_note_analysis_hash'
+down_revision = '007_ai_response_cache'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing summaries have no hash and are treated as stale
+    op.add_column('notes', sa.Column('ai_content_hash', sa.String(length=64), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('notes', 'ai_content_hash')
@@ -0,0 +1,21 @@
+"""Store action items and analysis time with a note's AI analysis.
+
+Revision ID: 009_note_analysis_results
+Revises: 008_note_analysis_hash
+Create Date: 2026-10-17 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009_note_analysis_results'
+down_revision = '008_note_analysis_hash'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('notes', sa.Column('ai_action_items', sa.Text(), nullable=True))
+    op.add_column('notes', sa.Column('ai_analyzed_at', sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('notes', 'ai_analyzed_at')
+    op.drop_column('notes', 'ai_action_items')
@@ -27,7 +27,43 @@ REQUESTS_IN_PROGRESS = Gauge(
 DB_CONNECTION_POOL = Gauge(
     'db_connection_pool',
     'Database Connection Pool Statistics',
-    ['state']  # idle, used, total
+    ['state']  # idle, used, overflow, total
+)
+
+DB_QUERY_LATENCY = Histogram(
+    'db_query_latency_seconds',
+    'Database Statement Latency',
+    ['fingerprint', 'operation']  # normalized statement hash, select/insert/...
+)
+
+QUERY_CACHE_REQUESTS = Counter(
+    'query_cache_requests',
+    'Query Result Cache Lookups',
+    ['method', 'result']  # hit, miss
+)
+
+AI_CACHE_REQUESTS = Counter(
+    'ai_cache_requests',
+    'AI Response Cache Lookups',
+    ['operation', 'result']  # memory_hit, database_hit, miss
+)
+
+AI_LIMITER_QUEUE_DEPTH = Gauge(
+    'ai_limiter_queue_depth',
+    'AI Calls Waiting For A Rate Limit Token',
+    ['model']
+)
+
+AI_LIMITER_WAIT = Histogram(
+    'ai_limiter_wait_seconds',
+    'Time AI Calls Waited For Admission',
+    ['model']
+)
+
+AI_PROVIDER_THROTTLED = Counter(
+    'ai_provider_throttled',
+    'AI Provider 429/503 Responses',
+    ['model']
 )
 
 FAILED_LOGIN_ATTEMPTS = Counter(
@@ -91,7 +127,9 @@ def init_metrics(app: FastAPI) -> None:
     """Initialize Prometheus metrics middleware."""
     app.add_middleware(PrometheusMiddleware)
     
-    # Initial values for DB pool metrics
-    DB_CONNECTION_POOL.labels(state='idle').set(0)
-    DB_CONNECTION_POOL.labels(state='used').set(0)
-    DB_CONNECTION_POOL.labels(state='total').set(0)
\ No newline at end of file
+    # DB pool metrics are read from the live pool at scrape time
+    from db.database import get_pool_status
+    for state in ('idle', 'used', 'overflow', 'total'):
+        DB_CONNECTION_POOL.labels(state=state).set_function(
+            lambda state=state: get_pool_status()[state]
+        )
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Fast JSON response class used as the application's default, and file
+download responses for streamed exports.
+"""
+from decimal import Decimal
+from typing import Any, AsyncIterator
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+    datetime/date, Enum, UUID and dataclasses are encoded natively by
+    orjson; Decimal, sets and pydantic models through _default.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    Returning an instance from a route skips FastAPI's jsonable_encoder
+    pass entirely. Pydantic models are serialized by pydantic-core
+    without being converted to dicts first, so a model built (and
+    validated) once is encoded once.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return dumps(content)
+
+def export_response(
+    body: AsyncIterator[bytes],
+    *,
+    media_type: str,
+    filename: str,
+    compressed: bool = False
+) -> StreamingResponse:
+    """
+    Stream an export as a file download.
+    Args:
+        body: Chunks of the file
+        media_type: Media type of the uncompressed content
+        filename: Download name without the .gz suffix
+        compressed: Whether the chunks are gzipped
+    Returns:
+        StreamingResponse: Attachment response
+    """
+    if compressed:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,69 @@
+"""
+Response models for list endpoints.
+
+List rows come from column projections (services.crud.projection) whose
+values the database has already typed, so routes return them through
+FastJSONResponse as is; these models document the payload in OpenAPI.
+"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from db.enums import ContactType, DealStage, TaskPriority, TaskStatus
+
+class TaskRow(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    category: Optional[str] = None
+    due_date: Optional[datetime] = None
+    assigned_to: Optional[int] = None
+    contact_id: Optional[int] = None
+    deal_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class DealRow(BaseModel):
+    id: int
+    title: str
+    stage: Optional[DealStage] = None
+    value: Optional[float] = None
+    currency: Optional[str] = None
+    probability: Optional[float] = None
+    contact_id: Optional[int] = None
+    assigned_to: Optional[int] = None
+    closed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ContactRow(BaseModel):
+    id: int
+    name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    position: Optional[str] = None
+    type: Optional[ContactType] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class TaskListResponse(BaseModel):
+    success: bool
+    data: List[TaskRow]
+
+class DealListResponse(BaseModel):
+    success: bool
+    data: List[DealRow]
+
+class ContactListResponse(BaseModel):
+    success: bool
+    data: List[ContactRow]
+
+class DashboardTasks(BaseModel):
+    todaysTasks: List[TaskRow]
+
+class DashboardTasksResponse(BaseModel):
+    success: bool
+    data: DashboardTasks
@@ -32,6 +32,14 @@ class WebSocketMessageType(str, Enum):
     # Notifications
     NOTIFICATION = "notification"
 
+    # Contact import
+    IMPORT_PROGRESS = "import_progress"
+    IMPORT_COMPLETED = "import_completed"
+
+    # Background AI jobs
+    AI_JOB_COMPLETED = "ai_job_completed"
+    AI_JOB_FAILED = "ai_job_failed"
+
 class WebSocketMessage(BaseModel):
     type: WebSocketMessageType
     payload: Dict[str, Any]
@@ -2,7 +2,7 @@
 Configuration loading using pydantic-settings and python-dotenv.
 """
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -25,6 +25,39 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./foundercrm.db"
+    DATABASE_REPLICA_URLS: List[str] = []  # Read replicas for read-only service methods
+    DB_ENGINE_PROFILE: str = "auto"  # auto, serverless, pooled, sqlite
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_SQLITE_POOL_SIZE: int = 5
+    DB_ECHO: bool = False  # Log every SQL statement (debugging only)
+    DB_SLOW_QUERY_MS: int = 200  # Log statements slower than this
+    DB_SLOW_QUERY_EXPLAIN: bool = False  # Attach the query plan to slow SELECTs
+    DB_QUERY_METRICS: bool = True  # Per-fingerprint latency histograms
+    # Services flush, and the request commits once before its response is sent.
+    # Only enable when every route using get_db is a UnitOfWorkRoute; other routes
+    # would commit after the response has gone out.
+    DB_UNIT_OF_WORK: bool = False
+    SEARCH_BACKEND: str = "fulltext"  # fulltext (tsvector / FTS5) or like
+    
+    # Query result cache
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_TTL: int = 60  # seconds
+    QUERY_CACHE_MAX_ENTRIES: int = 2048
+    QUERY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # Dashboard counters
+    COUNTERS_RECONCILE_INTERVAL: int = 6 * 60 * 60  # seconds between full rebuilds, 0 disables
+
+    # Contact import
+    CONTACT_IMPORT_CHUNK_SIZE: int = 500  # Contacts per insert transaction
+    IMPORT_REJECTS_DIR: str = "./imports/rejects"  # Downloadable reject files
+    # Reject files copy rows of the upload (personal data), so they are deleted
+    # this many seconds after they were written, 0 keeps them
+    IMPORT_REJECTS_TTL: int = 7 * 24 * 60 * 60
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -42,6 +75,38 @@ class Settings(BaseSettings):
     PERPLEXITY_API_KEY: str = ""  # Set this in .env file
     PERPLEXITY_MODEL: str = "sonar-medium-online"
     ENABLE_AI_FEATURES: bool = False  # Will be True only if PERPLEXITY_API_KEY is set
+    AI_JOB_WORKERS: int = 4  # Background AI jobs run concurrently per process
+    AI_JOB_QUEUE_SIZE: int = 1000  # Queued jobs before new ones are refused
+    AI_JOB_TIMEOUT: int = 120  # seconds before a running job is failed
+    AI_MAX_CONCURRENCY: int = 8  # Provider calls in flight per process
+    AI_RATE_LIMITS: Dict[str, float] = {}  # requests per minute by model
+    AI_DEFAULT_RATE_LIMIT: float = 50  # requests per minute for models not listed
+    AI_RATE_BURST: int = 5  # Calls allowed back to back before the rate applies
+    AI_MAX_RETRIES: int = 2  # Retries after a 429/503, honouring Retry-After
+    AI_HTTP2: bool = True  # Used when the h2 package is installed
+    AI_HTTP_CONNECT_TIMEOUT: float = 5.0  # seconds
+    AI_HTTP_READ_TIMEOUT: float = 60.0  # seconds between received bytes
+    AI_HTTP_WRITE_TIMEOUT: float = 10.0  # seconds
+    AI_HTTP_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    AI_HTTP_MAX_CONNECTIONS: int = 20
+    AI_HTTP_MAX_KEEPALIVE: int = 10  # Idle connections kept open
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    AI_CACHE_ENABLED: bool = True  # Reuse responses to identical prompts
+    AI_CACHE_PERSISTENT: bool = False  # Also keep responses in the ai_response_cache table
+    AI_CACHE_MAX_ENTRIES: int = 1024
+    AI_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    AI_CACHE_TTLS: Dict[str, int] = {  # seconds per AIService operation, 0 disables
+        "analyze_contact_note": 7 * 24 * 60 * 60,
+        "summarize_entity": 60 * 60,
+        "prioritize_tasks": 10 * 60,
+        "generate_email": 0,  # Regenerating a draft should give a new one
+        "analyze_notes": 7 * 24 * 60 * 60,
+    }
+    AI_BATCH_TOKEN_BUDGET: int = 3000  # Estimated prompt tokens of notes per batch request
+    AI_BATCH_MAX_NOTES: int = 20  # Notes per batch request
+    NOTE_ANALYSIS_REFRESH_INTERVAL: int = 5 * 60  # seconds between re-analyses of edited notes, 0 disables
+    NOTE_ANALYSIS_REFRESH_LIMIT: int = 200  # Edited notes re-analyzed per run
+    AI_SENTIMENT_TIMEOUT: float = 3.0  # seconds to wait for the provider before answering sentiment locally
     
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
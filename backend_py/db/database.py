@@ -1,24 +1,238 @@
 """
 SQLAlchemy async database configuration and session management.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+import functools
+import itertools
+import weakref
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import NullPool, StaticPool, QueuePool, AsyncAdaptedQueuePool
 from config import settings
+from .profiling import install_query_profiling, current_service_method
+
+# Supported engine profiles (DB_ENGINE_PROFILE):
+#   serverless - no pooling, one connection per session (short-lived workers)
+#   pooled     - bounded queue pool with overflow, recycling and pre-ping
+#   sqlite     - local single-file database tuned for SQLite
+ENGINE_PROFILES = ("serverless", "pooled", "sqlite")
+
+# Checked-out connection counts for pools without their own accounting
+# (NullPool, StaticPool), keyed by sync engine
+_checked_out: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Sync driver names mapped to their async equivalents
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def get_async_database_url(url: Optional[str] = None) -> str:
+    """
+    Normalize a database URL to use an async driver.
+    Args:
+        url: Database URL, defaults to settings.DATABASE_URL
+    Returns:
+        str: URL usable by create_async_engine
+    """
+    parsed = make_url(url or settings.DATABASE_URL)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def resolve_engine_profile(url: str, profile: Optional[str] = None) -> str:
+    """
+    Resolve the engine profile for a URL.
+    Args:
+        url: Database URL
+        profile: Requested profile, defaults to settings.DB_ENGINE_PROFILE
+    Returns:
+        str: One of ENGINE_PROFILES
+    """
+    profile = (profile or settings.DB_ENGINE_PROFILE).lower()
+    if profile == "auto":
+        return "sqlite" if make_url(url).get_backend_name() == "sqlite" else "serverless"
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(
+            f"Unknown DB_ENGINE_PROFILE '{profile}', expected auto or one of {ENGINE_PROFILES}"
+        )
+    return profile
+
+def _engine_options(url: str, profile: str) -> Dict[str, Any]:
+    """Build create_async_engine keyword arguments for a profile."""
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "logging_name": "sqlalchemy.engine",
+    }
+
+    if profile == "serverless":
+        options["poolclass"] = NullPool
+    elif profile == "pooled":
+        options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    else:  # sqlite
+        database = make_url(url).database
+        options["connect_args"] = {"check_same_thread": False}
+        if not database or database == ":memory:":
+            # Every session must share the one in-memory database
+            options["poolclass"] = StaticPool
+        else:
+            options.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.DB_SQLITE_POOL_SIZE,
+                max_overflow=0,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so readers don't block the single writer."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+def create_engine_for_profile(
+    url: Optional[str] = None,
+    profile: Optional[str] = None
+) -> AsyncEngine:
+    """
+    Create an async engine configured for an engine profile.
+    Args:
+        url: Database URL, defaults to settings.DATABASE_URL
+        profile: Engine profile, defaults to settings.DB_ENGINE_PROFILE
+    Returns:
+        AsyncEngine: Configured engine
+    """
+    url = get_async_database_url(url)
+    profile = resolve_engine_profile(url, profile)
+    new_engine = create_async_engine(url, **_engine_options(url, profile))
+
+    if profile == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    install_query_profiling(new_engine.sync_engine)
+
+    sync_engine = new_engine.sync_engine
+    _checked_out[sync_engine] = 0
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _checked_out[sync_engine] += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        _checked_out[sync_engine] -= 1
+
+    return new_engine
+
+def get_pool_status(target: Optional[AsyncEngine] = None) -> Dict[str, int]:
+    """
+    Get live connection pool statistics.
+    Args:
+        target: Engine to inspect, defaults to the primary engine
+    Returns:
+        Dict[str, int]: Connection counts by state (idle, used, overflow, total)
+    """
+    target = target or engine
+    pool = target.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        idle = pool.checkedin()
+        used = pool.checkedout()
+        return {
+            "idle": idle,
+            "used": used,
+            "overflow": max(pool.overflow(), 0),
+            "total": idle + used,
+        }
+
+    used = max(_checked_out.get(target.sync_engine, 0), 0)
+    return {"idle": 0, "used": used, "overflow": 0, "total": used}
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,  # Always show SQL for debugging
-    echo_pool=True,  # Show connection pool events
-    poolclass=NullPool,  # Disable connection pooling for serverless deployment
-    logging_name='sqlalchemy.engine'
-)
+engine = create_engine_for_profile()
+
+# Optional read replicas, same engine profile as the primary
+replica_engines = [create_engine_for_profile(url) for url in settings.DATABASE_REPLICA_URLS]
+_replica_counter = itertools.count()
+
+class RoutingSession(Session):
+    """
+    Session that sends reads made inside read-only service methods to a
+    replica. Once the session has written anything, every later statement
+    goes to the primary so the request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            replica_engines
+            and self.info.get("route_read_only")
+            and not self.info.get("sticky_primary")
+            and not self._flushing
+        ):
+            # Stay on one replica for the whole session
+            if "replica_index" not in self.info:
+                self.info["replica_index"] = next(_replica_counter) % len(replica_engines)
+            return replica_engines[self.info["replica_index"]].sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+def route_session(read_only: bool):
+    """
+    Decorator routing a service method's queries. The outermost routed
+    call decides, so reads made inside a write method stay on the primary.
+    The method is also recorded for the slow-query log.
+    Args:
+        read_only: Whether the method may read from a replica
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Lets the slow-query log name the service method behind a query
+            method_token = current_service_method.set(func.__qualname__)
+            try:
+                db = next(
+                    (arg for arg in (*args, *kwargs.values()) if isinstance(arg, AsyncSession)),
+                    None
+                )
+                if db is None or "route_read_only" in db.info:
+                    return await func(*args, **kwargs)
+
+                db.info["route_read_only"] = read_only
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    db.info.pop("route_read_only", None)
+            finally:
+                current_service_method.reset(method_token)
+
+        wrapper.__routed__ = True
+        return wrapper
+    return decorator
+
+read_only = route_session(True)
+# For reads that must see the latest commits (e.g. polled job state)
+primary_only = route_session(False)
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
@@ -26,24 +240,100 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 async def init_db():
-    """Initialize database and create tables."""
+    """Initialize database, create tables and full-text search indexes."""
+    from .search import install_full_text_search
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(install_full_text_search)
+
+async def dispose_engines():
+    """Close all pooled connections on the primary and replicas."""
+    for target in (engine, *replica_engines):
+        await target.dispose()
+
+# has_writes tracks uncommitted writes; sticky_primary keeps the rest of
+# the session on the primary after its first write
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+    session.info["sticky_primary"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+        orm_execute_state.session.info["sticky_primary"] = True
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session):
+    session.info["has_writes"] = False
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Check whether a session has uncommitted or unflushed writes."""
+    return bool(
+        session.info.get("has_writes")
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+# Sessions opened by get_db for the current request, collected by UnitOfWorkRoute
+_request_sessions: ContextVar[Optional[List[AsyncSession]]] = ContextVar(
+    "request_sessions", default=None
+)
 
 async def get_db():
     """
     FastAPI dependency for getting async DB session.
+    With DB_UNIT_OF_WORK the session is one unit of work: services only
+    flush, and the request commits once. Routes must use UnitOfWorkRoute so
+    the commit happens before the response is sent; FastAPI only runs the
+    cleanup after the yield once the response has gone out. Requests that
+    wrote nothing skip the commit.
     Usage:
         @router.get("/")
         async def route(db: AsyncSession = Depends(get_db)):
             ...
     """
     async with AsyncSessionLocal() as session:
+        session.info["unit_of_work"] = settings.DB_UNIT_OF_WORK
+        sessions = _request_sessions.get()
+        if sessions is not None:
+            sessions.append(session)
         try:
             yield session
-            await session.commit()
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Route that commits the request's get_db sessions after the endpoint
+    returns and before the response is sent, so clients never see a
+    response for writes that are not yet durable. A failed commit becomes
+    the request's error response.
+    Usage:
+        router = APIRouter(route_class=UnitOfWorkRoute)
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def unit_of_work_handler(request: Request) -> Response:
+            token = _request_sessions.set([])
+            try:
+                response = await handler(request)
+                for session in _request_sessions.get():
+                    if has_pending_writes(session):
+                        await session.commit()
+                return response
+            finally:
+                _request_sessions.reset(token)
+
+        return unit_of_work_handler
@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for all database tables.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Float, Table, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Float, Table, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -12,11 +12,16 @@ contact_tags = Table(
     'contact_tags',
     Base.metadata,
     Column('contact_id', Integer, ForeignKey('contacts.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id')),
+    Index('uq_contact_tags_contact_id_tag_id', 'contact_id', 'tag_id', unique=True),
+    Index('ix_contact_tags_tag_id', 'tag_id')
 )
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_workspace_id', 'workspace_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
@@ -47,6 +52,12 @@ class Workspace(Base):
 
 class Contact(Base):
     __tablename__ = 'contacts'
+    __table_args__ = (
+        Index('ix_contacts_workspace_id_type', 'workspace_id', 'type'),
+        Index('ix_contacts_workspace_id_created_at', 'workspace_id', 'created_at'),
+        Index('ix_contacts_workspace_id_email', 'workspace_id', 'email'),
+        Index('ix_contacts_created_by', 'created_by'),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
@@ -70,6 +81,16 @@ class Contact(Base):
 
 class Task(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index('ix_tasks_workspace_id_status_due_date', 'workspace_id', 'status', 'due_date'),
+        Index('ix_tasks_workspace_id_priority_due_date', 'workspace_id', 'priority', 'due_date'),
+        Index('ix_tasks_workspace_id_assigned_to_due_date', 'workspace_id', 'assigned_to', 'due_date'),
+        Index('ix_tasks_workspace_id_due_date', 'workspace_id', 'due_date'),
+        Index('ix_tasks_workspace_id_created_at', 'workspace_id', 'created_at'),
+        Index('ix_tasks_assigned_to', 'assigned_to'),
+        Index('ix_tasks_contact_id', 'contact_id'),
+        Index('ix_tasks_deal_id', 'deal_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
@@ -95,6 +116,13 @@ class Task(Base):
 
 class Deal(Base):
     __tablename__ = 'deals'
+    __table_args__ = (
+        Index('ix_deals_workspace_id_stage_updated_at', 'workspace_id', 'stage', 'updated_at'),
+        Index('ix_deals_workspace_id_updated_at', 'workspace_id', 'updated_at'),
+        Index('ix_deals_contact_id_updated_at', 'contact_id', 'updated_at'),
+        Index('ix_deals_assigned_to', 'assigned_to'),
+        Index('ix_deals_created_by', 'created_by'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
@@ -120,6 +148,10 @@ class Deal(Base):
 
 class Interaction(Base):
     __tablename__ = 'interactions'
+    __table_args__ = (
+        Index('ix_interactions_contact_id_interaction_date', 'contact_id', 'interaction_date'),
+        Index('ix_interactions_user_id', 'user_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     type = Column(String(50))  # email, call, meeting, note
@@ -134,10 +166,17 @@ class Interaction(Base):
 
 class Note(Base):
     __tablename__ = 'notes'
+    __table_args__ = (
+        Index('ix_notes_workspace_id_created_at', 'workspace_id', 'created_at'),
+        Index('ix_notes_contact_id_created_at', 'contact_id', 'created_at'),
+        Index('ix_notes_deal_id_created_at', 'deal_id', 'created_at'),
+        Index('ix_notes_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
     type = Column(Enum(NoteType), default=NoteType.GENERAL)
+    workspace_id = Column(Integer, ForeignKey('workspaces.id'))
     contact_id = Column(Integer, ForeignKey('contacts.id'))
     deal_id = Column(Integer, ForeignKey('deals.id'))
     user_id = Column(Integer, ForeignKey('users.id'))
@@ -145,6 +184,9 @@ class Note(Base):
     updated_at = Column(DateTime, onupdate=func.now())
     ai_summary = Column(Text)  # AI-generated summary
     sentiment = Column(String(20))  # AI-detected sentiment
+    ai_action_items = Column(Text)  # JSON list of AI-extracted action items
+    ai_content_hash = Column(String(64))  # sha256 of the content ai_summary/sentiment were derived from
+    ai_analyzed_at = Column(DateTime)  # When the stored analysis was made
 
     contact = relationship("Contact", back_populates="notes")
     deal = relationship("Deal", back_populates="notes")
@@ -152,6 +194,9 @@ class Note(Base):
 
 class Tag(Base):
     __tablename__ = 'tags'
+    __table_args__ = (
+        Index('uq_tags_workspace_id_name', 'workspace_id', 'name', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
@@ -161,6 +206,10 @@ class Tag(Base):
 
 class AISuggestion(Base):
     __tablename__ = 'ai_suggestions'
+    __table_args__ = (
+        Index('ix_ai_suggestions_workspace_id_created_at', 'workspace_id', 'created_at'),
+        Index('ix_ai_suggestions_user_id', 'user_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     type = Column(String(50))  # task, deal, contact
@@ -172,4 +221,50 @@ class AISuggestion(Base):
     is_applied = Column(Boolean, default=False)
 
     workspace = relationship("Workspace")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+class AIJob(Base):
+    """Background AI operation run by services.ai.jobs.AIJobQueue."""
+    __tablename__ = 'ai_jobs'
+    __table_args__ = (
+        Index('ix_ai_jobs_status_created_at', 'status', 'created_at'),
+        Index('ix_ai_jobs_workspace_id_created_at', 'workspace_id', 'created_at'),
+    )
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    operation = Column(String(50), nullable=False)  # AIService method
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    payload = Column(Text, nullable=False)  # JSON arguments
+    result = Column(Text)  # JSON result
+    error = Column(Text)
+    workspace_id = Column(Integer, ForeignKey('workspaces.id'))
+    user_id = Column(Integer, ForeignKey('users.id'))
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class AIResponseCache(Base):
+    """Persistent tier of the AI response cache (services.ai.cache)."""
+    __tablename__ = 'ai_response_cache'
+    __table_args__ = (
+        Index('uq_ai_response_cache_cache_key', 'cache_key', unique=True),
+        Index('ix_ai_response_cache_expires_at', 'expires_at'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), nullable=False)  # sha256 of model, messages and sampling params
+    operation = Column(String(50))
+    response = Column(Text, nullable=False)  # JSON API response
+    created_at = Column(DateTime, server_default=func.now())
+    expires_at = Column(DateTime, nullable=False)
+
+class WorkspaceCounter(Base):
+    """
+    Dashboard counter of one workspace, e.g. "tasks.status.todo" or
+    "deals.stage.won.value". Maintained by services.crud.counters.
+    """
+    __tablename__ = 'workspace_counters'
+
+    workspace_id = Column(Integer, ForeignKey('workspaces.id'), primary_key=True)
+    name = Column(String(100), primary_key=True)
+    value = Column(Float, nullable=False, default=0)
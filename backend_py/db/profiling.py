@@ -0,0 +1,133 @@
+"""
+Statement profiling: per-fingerprint latency metrics and a slow-query log.
+"""
+import hashlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+from app.core.metrics import DB_QUERY_LATENCY
+
+logger = logging.getLogger("db.slow_query")
+
+# Service method currently issuing queries, set by db.database.route_session
+current_service_method: ContextVar[Optional[str]] = ContextVar(
+    "current_service_method", default=None
+)
+
+SENSITIVE_PARAMS = ("password", "secret", "token", "api_key")
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                    # string literals
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                 # numbers
+    (re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?"), "?"),           # bind parameters
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),    # IN lists / VALUES rows
+    (re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+"), "(...)"),  # multi-row VALUES
+    (re.compile(r"\s+"), " "),
+]
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so queries differing only in literals, bind
+    parameters or IN-list length share a fingerprint.
+    Returns:
+        str: Short hash of the normalized statement
+    """
+    normalized = statement.strip()
+    for pattern, replacement in _LITERALS:
+        normalized = pattern.sub(replacement, normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+def _operation(statement: str) -> str:
+    """Leading SQL keyword, e.g. select or insert."""
+    keyword = statement.lstrip().split(None, 1)
+    return keyword[0].lower() if keyword else "unknown"
+
+def _redact_value(key: Any, value: Any) -> Any:
+    if isinstance(key, str) and any(s in key.lower() for s in SENSITIVE_PARAMS):
+        return "***"
+    if value is None or isinstance(value, (bool, int, float, Decimal, date, datetime)):
+        return value
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Keep numeric/date parameters, replace text with its length."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {k: _redact_value(k, v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(None, v) for v in parameters]
+    return parameters
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """Fetch the query plan for a slow SELECT."""
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    conn.info["explaining"] = True
+    try:
+        result = conn.exec_driver_sql(f"{prefix} {statement}", parameters)
+        return "\n".join(str(row[-1]) for row in result)
+    except Exception as e:
+        return f"<explain failed: {e}>"
+    finally:
+        conn.info["explaining"] = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    if conn.info.get("explaining"):
+        return
+    elapsed = time.perf_counter() - started
+    operation = _operation(statement)
+
+    if settings.DB_QUERY_METRICS:
+        DB_QUERY_LATENCY.labels(
+            fingerprint=fingerprint(statement),
+            operation=operation
+        ).observe(elapsed)
+
+    if elapsed * 1000 < settings.DB_SLOW_QUERY_MS:
+        return
+
+    plan = None
+    if settings.DB_SLOW_QUERY_EXPLAIN and operation == "select" and not executemany:
+        plan = _explain(conn, statement, parameters)
+
+    logger.warning(
+        "Slow query %.1fms [%s] from %s: %s | params=%s%s",
+        elapsed * 1000,
+        fingerprint(statement),
+        current_service_method.get() or "unknown",
+        " ".join(statement.split()),
+        redact_parameters(parameters, executemany),
+        f"\n{plan}" if plan else ""
+    )
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+def install_query_profiling(engine: Engine) -> None:
+    """
+    Attach timing hooks to a (sync) engine.
+    Args:
+        engine: Engine to profile (use AsyncEngine.sync_engine)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,90 @@
+"""
+Full-text search indexes for contacts and notes.
+
+Postgres stores a generated tsvector column with a GIN index; SQLite uses an
+external-content FTS5 table kept in sync by triggers. Both are maintained by
+the database itself on insert/update/delete.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Searchable tables and the text columns they index
+SEARCH_INDEXES = {
+    "contacts": ["name", "email", "company"],
+    "notes": ["content"],
+}
+
+def fts_table(table: str) -> str:
+    """Name of the SQLite FTS5 table for a table."""
+    return f"{table}_fts"
+
+def _install_postgres(connection: Connection, table: str, columns) -> None:
+    document = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+    connection.execute(text(
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED"
+    ))
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+        f"ON {table} USING GIN (search_vector)"
+    ))
+
+def _install_sqlite(connection: Connection, table: str, columns) -> None:
+    fts = fts_table(table)
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": fts}
+    ).first()
+
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id')"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    ))
+
+    if not exists:
+        # Index rows that existed before the FTS table was created
+        connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+def install_full_text_search(connection: Connection) -> None:
+    """
+    Create full-text search structures for the connection's dialect.
+    Safe to run repeatedly. Other dialects are left untouched.
+    Args:
+        connection: Sync connection (use AsyncConnection.run_sync)
+    """
+    dialect = connection.dialect.name
+    for table, columns in SEARCH_INDEXES.items():
+        if dialect == "postgresql":
+            _install_postgres(connection, table, columns)
+        elif dialect == "sqlite":
+            _install_sqlite(connection, table, columns)
+
+def drop_full_text_search(connection: Connection) -> None:
+    """Remove the structures created by install_full_text_search."""
+    dialect = connection.dialect.name
+    for table in SEARCH_INDEXES:
+        if dialect == "postgresql":
+            connection.execute(text(f"DROP INDEX IF EXISTS ix_{table}_search_vector"))
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"))
+        elif dialect == "sqlite":
+            fts = fts_table(table)
+            for suffix in ("ai", "ad", "au"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
@@ -1,8 +1,9 @@
 """
 FastAPI application entry point with startup/shutdown events, CORS, JWT middleware, and error handlers.
 """
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 import uvicorn
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,9 +16,14 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 # Import internal modules
-from db.database import init_db
+from db.database import init_db, dispose_engines
 from db.enums import UserRole
+from services.ai import ai_service, ai_job_queue
+from services.ai.notes import run_note_analysis_refresh
+from services.crud.counters import run_counter_reconciliation
+from services.contact_import import purge_reject_files
 from app.core.errors import add_error_handlers
+from app.core.responses import FastJSONResponse
 from app.core.docs import setup_docs
 from utils.permissions import RoleMiddleware, WorkspaceMiddleware
 from routers import auth, contacts, tasks, deals, dashboard, ai, health, websocket
@@ -38,17 +44,38 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing application...")
     await init_db()
     logger.info("Database initialized")
+    purge_reject_files()
+    reconciler = None
+    if settings.COUNTERS_RECONCILE_INTERVAL > 0:
+        reconciler = asyncio.create_task(run_counter_reconciliation())
+    note_refresher = None
+    if settings.NOTE_ANALYSIS_REFRESH_INTERVAL > 0:
+        note_refresher = asyncio.create_task(run_note_analysis_refresh())
+    await ai_service.start()
+    await ai_job_queue.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    if note_refresher:
+        note_refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await note_refresher
+    await ai_job_queue.stop()
+    await ai_service.close()
+    if reconciler:
+        reconciler.cancel()
+        with suppress(asyncio.CancelledError):
+            await reconciler
+    await dispose_engines()
 
 # Create FastAPI application
 app = FastAPI(
     title="FounderCRM API",
     version="1.0.0",
     description="CRM system with AI-powered features",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
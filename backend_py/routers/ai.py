@@ -1,19 +1,36 @@
 """
 AI feature endpoints using Perplexity API for various CRM operations.
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+from contextlib import aclosing
+from datetime import datetime
+from typing import List, Dict, Any, AsyncIterator, Optional
+import logging
+import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.database import get_db
+from config import settings
+from app.core.responses import FastJSONResponse, dumps
+from db.database import get_db, UnitOfWorkRoute
 from db.models import User
 from db.enums import TaskStatus, TaskPriority
-from services.ai import ai_service
-from services.crud import contact_service, deal_service, task_service, note_service
+from services.ai import ai_service, ai_job_queue
+from services.ai import notes as note_analysis
+from services.ai.limiter import current_workspace_id
+from services.crud import ai_job_service, contact_service, deal_service, task_service, note_service
 from app.utils.deps import get_current_user, get_current_workspace_id
 
-router = APIRouter(prefix="/api")
+logger = logging.getLogger(__name__)
+
+async def bind_workspace(workspace_id: int = Depends(get_current_workspace_id)) -> None:
+    """Queue this request's AI calls under its workspace (fair rate limiting)."""
+    current_workspace_id.set(workspace_id)
+
+router = APIRouter(prefix="/api", dependencies=[Depends(bind_workspace)], route_class=UnitOfWorkRoute)
 
 class EmailRequest(BaseModel):
     """Email generation request model."""
@@ -22,34 +39,193 @@ class EmailRequest(BaseModel):
     template: str = "default"
     tone: str = "professional"
 
+class NoteBatchRequest(BaseModel):
+    """Batch note analysis request model."""
+    note_ids: List[int] = Field(..., min_length=1, max_length=100)
+    force: bool = False  # Re-analyze notes whose stored analysis is current
+
+BACKGROUND_DESCRIPTION = "Queue the request and answer 202 with a job ID (see GET /ai/jobs/{job_id})"
+
+async def _enqueue(
+    operation: str,
+    *args: Any,
+    workspace_id: int,
+    user: User,
+    **kwargs: Any
+) -> FastJSONResponse:
+    """Queue an AIService call as a background job and answer 202 Accepted."""
+    job_id = await ai_job_queue.submit(
+        operation, *args, workspace_id=workspace_id, user_id=user.id, **kwargs
+    )
+    return FastJSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued"}
+    )
+
+def _sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    """One Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+def _stream(chunks: AsyncIterator[str], done: Dict[str, Any]) -> StreamingResponse:
+    """
+    Relay completion text as Server-Sent Events: a "token" event per piece,
+    then "done" with `done` as payload, or "error" if the provider call
+    failed. When the client disconnects the response is cancelled, which
+    closes `chunks` and with it the upstream request.
+    """
+    async def events() -> AsyncIterator[bytes]:
+        async with aclosing(chunks):
+            try:
+                async for content in chunks:
+                    yield _sse_event("token", {"content": content})
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("AI stream failed: %s", e)
+                yield _sse_event("error", {"detail": f"AI request failed: {str(e)}"})
+                return
+        yield _sse_event("done", done)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/ai/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(get_current_workspace_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get the status of a background AI job, and its result once completed.
+    """
+    job = await ai_job_service.get_job(db, job_id, workspace_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job.id,
+        "operation": job.operation,
+        "status": job.status,
+        "result": orjson.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+
 @router.post("/ai/analyze-note/{note_id}")
 async def analyze_note(
     note_id: int,
     mode: str = Query("insights", enum=["insights", "sentiment", "action-items"]),
+    force: bool = Query(False, description="Re-analyze even if the stored analysis is current"),
+    background: bool = Query(False, description=BACKGROUND_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     workspace_id: int = Depends(get_current_workspace_id),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Analyze a note using AI to extract insights, sentiment, or action items.
+    The analysis is stored on the note and served from there until the
+    note's content changes. Sentiment comes from the local lexicon
+    analyzer when AI features are off, or when the provider fails or takes
+    longer than AI_SENTIMENT_TIMEOUT.
     """
-    note_data = await note_service.analyze_note(db, note_id, workspace_id)
-    if not note_data:
+    notes = await note_service.get_notes_for_analysis(db, [note_id], workspace_id)
+    if not notes:
         raise HTTPException(status_code=404, detail="Note not found")
+    note = notes[0]
+
+    if mode == "sentiment" and not ai_service.enabled and (
+        force or not note_service.analysis_is_current(note)
+    ):
+        return await _local_sentiment(db, note)
+
+    if background and (force or not note_service.analysis_is_current(note)):
+        return await _enqueue(
+            "refresh_note_analyses", [note_id], workspace_id,
+            workspace_id=workspace_id, user=current_user, force=force
+        )
 
     try:
-        analysis = await ai_service.analyze_contact_note(note_data, mode=mode)
-        return analysis
+        results, _ = await note_analysis.analyze_notes(
+            db, [note], force=force,
+            timeout=settings.AI_SENTIMENT_TIMEOUT if mode == "sentiment" else None
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        if mode == "sentiment" and isinstance(e, (asyncio.TimeoutError, httpx.HTTPError)):
+            return await _local_sentiment(db, note)
+        raise HTTPException(
+            status_code=500,
+            detail=f"AI analysis failed: {str(e)}"
+        )
+    result = results[0]
+    if "error" in result:
+        if mode == "sentiment":
+            return await _local_sentiment(db, note)
+        raise HTTPException(
+            status_code=500,
+            detail=f"AI analysis failed: {result['error']}"
+        )
+
+    if mode == "insights":
+        analysis = result["summary"]
+    elif mode == "sentiment":
+        analysis = result["sentiment"]
+    else:  # action-items
+        analysis = "\n".join(f"- {item}" for item in result["action_items"])
+    return {**result, "analysis": analysis, "mode": mode}
+
+async def _local_sentiment(db: AsyncSession, note) -> Dict[str, Any]:
+    """Score a note with the local lexicon tier (no provider) and store its sentiment."""
+    result = (await note_analysis.fill_sentiments(db, [note]))[0]
+    return {**result, "analysis": result["sentiment"], "mode": "sentiment", "source": "lexicon"}
+
+@router.post("/ai/analyze-notes")
+async def analyze_notes(
+    request: NoteBatchRequest,
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(get_current_workspace_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Analyze many notes at once (summary, sentiment, action items).
+    Notes are packed into as few AI requests as fit the token budget;
+    notes whose stored analysis matches their content are not sent.
+    """
+    note_ids = list(dict.fromkeys(request.note_ids))
+    notes = await note_service.get_notes_for_analysis(db, note_ids, workspace_id)
+
+    try:
+        analyses, prompts = await note_analysis.analyze_notes(db, notes, force=request.force)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"AI analysis failed: {str(e)}"
         )
 
+    results = {analysis["note_id"]: analysis for analysis in analyses}
+    skipped = sum(1 for analysis in analyses if analysis["cached"])
+    return {
+        "results": [
+            results.get(note_id, {"note_id": note_id, "error": "Note not found"})
+            for note_id in note_ids
+        ],
+        "analyzed": len(analyses) - skipped,
+        "skipped": skipped,
+        "prompts": prompts
+    }
+
 @router.post("/ai/prioritize-tasks")
 async def prioritize_tasks(
     status: Optional[TaskStatus] = None,
     limit: int = Query(10, ge=1, le=20),
+    background: bool = Query(False, description=BACKGROUND_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     workspace_id: int = Depends(get_current_workspace_id),
     db: AsyncSession = Depends(get_db)
@@ -75,6 +251,11 @@ async def prioritize_tasks(
         for task in tasks[:limit]
     ]
 
+    if background:
+        return await _enqueue(
+            "prioritize_tasks", task_data, workspace_id=workspace_id, user=current_user
+        )
+
     try:
         analysis = await ai_service.prioritize_tasks(task_data)
         return analysis
@@ -88,6 +269,7 @@ async def prioritize_tasks(
 async def generate_email(
     contact_id: int,
     request: EmailRequest,
+    background: bool = Query(False, description=BACKGROUND_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     workspace_id: int = Depends(get_current_workspace_id),
     db: AsyncSession = Depends(get_db)
@@ -95,6 +277,59 @@ async def generate_email(
     """
     Generate an email draft for a contact using AI.
     """
+    email_context = await _email_context(db, contact_id, workspace_id, request)
+
+    if background:
+        return await _enqueue(
+            "generate_email", email_context,
+            workspace_id=workspace_id, user=current_user,
+            template=request.template, tone=request.tone
+        )
+
+    try:
+        email = await ai_service.generate_email(
+            email_context,
+            template=request.template,
+            tone=request.tone
+        )
+        return email
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Email generation failed: {str(e)}"
+        )
+
+@router.post("/ai/generate-email/{contact_id}/stream")
+async def stream_email(
+    contact_id: int,
+    request: EmailRequest,
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(get_current_workspace_id),
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Generate an email draft for a contact, streamed as Server-Sent Events
+    while it is written.
+    """
+    email_context = await _email_context(db, contact_id, workspace_id, request)
+    chunks = ai_service.stream_email(
+        email_context,
+        template=request.template,
+        tone=request.tone
+    )
+    return _stream(chunks, {
+        "template": request.template,
+        "tone": request.tone,
+        "generated_at": datetime.utcnow().isoformat()
+    })
+
+async def _email_context(
+    db: AsyncSession,
+    contact_id: int,
+    workspace_id: int,
+    request: EmailRequest
+) -> Dict[str, Any]:
+    """Email generation context for a contact of the workspace (404 if missing)."""
     contact = await contact_service.get_with_relations(db, contact_id, workspace_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
@@ -103,7 +338,7 @@ async def generate_email(
         db, workspace_id, contact_id=contact_id, limit=1
     )
 
-    email_context = {
+    return {
         "recipient_name": contact.name,
         "recipient_company": contact.company,
         "purpose": request.purpose,
@@ -111,30 +346,62 @@ async def generate_email(
         "previous_interaction": recent_notes[0].content if recent_notes else None
     }
 
-    try:
-        email = await ai_service.generate_email(
-            email_context,
-            template=request.template,
-            tone=request.tone
+@router.post("/ai/summarize/{entity_type}/{entity_id}")
+async def summarize_entity(
+    entity_type: str = Path(..., pattern="^(contact|deal)$"),
+    entity_id: int = Path(...),
+    background: bool = Query(False, description=BACKGROUND_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(get_current_workspace_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Generate an AI summary for a contact or deal.
+    """
+    entity_data = await _entity_data(db, entity_type, entity_id, workspace_id)
+
+    if background:
+        return await _enqueue(
+            "summarize_entity", entity_type, entity_data,
+            workspace_id=workspace_id, user=current_user
         )
-        return email
+
+    try:
+        summary = await ai_service.summarize_entity(entity_type, entity_data)
+        return summary
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Email generation failed: {str(e)}"
+            detail=f"Summary generation failed: {str(e)}"
         )
 
-@router.post("/ai/summarize/{entity_type}/{entity_id}")
-async def summarize_entity(
+@router.post("/ai/summarize/{entity_type}/{entity_id}/stream")
+async def stream_summary(
     entity_type: str = Path(..., pattern="^(contact|deal)$"),
     entity_id: int = Path(...),
     current_user: User = Depends(get_current_user),
     workspace_id: int = Depends(get_current_workspace_id),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> StreamingResponse:
     """
-    Generate an AI summary for a contact or deal.
+    Generate an AI summary for a contact or deal, streamed as Server-Sent
+    Events while it is written.
     """
+    entity_data = await _entity_data(db, entity_type, entity_id, workspace_id)
+    chunks = ai_service.stream_summary(entity_type, entity_data)
+    return _stream(chunks, {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "generated_at": datetime.utcnow().isoformat()
+    })
+
+async def _entity_data(
+    db: AsyncSession,
+    entity_type: str,
+    entity_id: int,
+    workspace_id: int
+) -> Dict[str, Any]:
+    """Summary input for a contact or deal of the workspace (404 if missing)."""
     entity = None
     if entity_type == "contact":
         entity = await contact_service.get_with_relations(db, entity_id, workspace_id)
@@ -159,7 +426,7 @@ async def summarize_entity(
                 for deal in entity.deals
             ],
             "last_interaction": (
-                entity.notes[-1].created_at.isoformat()
+                entity.notes[0].created_at.isoformat()
                 if entity.notes else None
             )
         }
@@ -176,12 +443,4 @@ async def summarize_entity(
             ],
             "updated_at": entity.updated_at.isoformat()
         }
-
-    try:
-        summary = await ai_service.summarize_entity(entity_type, entity_data)
-        return summary
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Summary generation failed: {str(e)}"
-        )
+    return entity_data
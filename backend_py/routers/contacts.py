@@ -1,17 +1,39 @@
 """
-Contact endpoints: getContacts, getContact, createContact, updateContact, deleteContact, addInteraction
+Contact endpoints: getContacts, exportContacts, importContacts, getImportRejects, getContact, createContact, updateContact, deleteContact, addInteraction
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from app.core.responses import FastJSONResponse
+from app.schemas.lists import ContactListResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_db, UnitOfWorkRoute
 from utils.jwt import get_current_user
 from services.contact_service import ContactService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
-@router.get("/")
-async def get_contacts(user=Depends(get_current_user), type: str = None, search: str = None):
+@router.get("/", response_model=ContactListResponse)
+async def get_contacts(user=Depends(get_current_user), type: str = None, search: str = None,
+                       limit: int = Query(100, ge=1, le=500), offset: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
     """Get all contacts for workspace."""
-    return await ContactService.get_contacts(user, type, search)
+    return FastJSONResponse(await ContactService.get_contacts(user, db, type, search, limit, offset))
+
+@router.get("/export")
+async def export_contacts(user=Depends(get_current_user), format: str = Query("csv", pattern="^(csv|ndjson)$"), gzip: bool = False,
+                          type: str = None, search: str = None, db: AsyncSession = Depends(get_db)):
+    """Export all matching contacts as CSV or NDJSON."""
+    return ContactService.export_contacts(user, db, format, gzip, type, search)
+
+@router.post("/import")
+async def import_contacts(file: UploadFile = File(...), format: str = Query(None, pattern="^(csv|json)$"),
+                          user=Depends(get_current_user)):
+    """Import contacts from a CSV or JSON (array or NDJSON) upload."""
+    return await ContactService.import_contacts(user, file, format)
+
+@router.get("/import/{import_id}/rejects")
+async def get_import_rejects(import_id: str, user=Depends(get_current_user)):
+    """Download the rejected rows of an import."""
+    return ContactService.get_import_rejects(user, import_id)
 
 @router.get("/{id}")
 async def get_contact(id: int, user=Depends(get_current_user)):
@@ -2,17 +2,23 @@
 Dashboard endpoints: getFounderDashboard, getTeamMemberDashboard, getActivityLogs
 """
 from fastapi import APIRouter, Depends, HTTPException
+from app.core.responses import FastJSONResponse
+from app.schemas.lists import DashboardTasksResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.jwt import get_current_user
-from db.database import get_db
+from db.database import get_db, UnitOfWorkRoute
 from services.dashboard_service import DashboardService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/founder")
-async def get_founder_dashboard(user=Depends(get_current_user)):
+async def get_founder_dashboard(
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Get dashboard data for founder."""
-    return await DashboardService.get_founder_dashboard(user)
+    dashboard_service = DashboardService()
+    return await dashboard_service.get_founder_dashboard(user, db)
 
 @router.get("/team-member")
 async def get_team_member_dashboard(user=Depends(get_current_user)):
@@ -24,7 +30,7 @@ async def get_activity_logs(user=Depends(get_current_user)):
     """Get activity logs."""
     return await DashboardService.get_activity_logs(user)
 
-@router.get("/founder/tasks", response_model=dict)
+@router.get("/founder/tasks", response_model=DashboardTasksResponse)
 async def get_founder_tasks(
     user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -32,7 +38,7 @@ async def get_founder_tasks(
     """Get tasks for founder dashboard."""
     try:
         dashboard_service = DashboardService()
-        return await dashboard_service.get_founder_tasks(user, db)
+        return FastJSONResponse(await dashboard_service.get_founder_tasks(user, db))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -41,7 +47,7 @@ async def get_founder_tasks(
             detail=f"Unexpected error retrieving tasks: {str(e)}"
         )
 
-@router.get("/team-member/tasks", response_model=dict)
+@router.get("/team-member/tasks", response_model=DashboardTasksResponse)
 async def get_team_member_tasks(
     user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -49,7 +55,7 @@ async def get_team_member_tasks(
     """Get tasks for team member dashboard."""
     try:
         dashboard_service = DashboardService()
-        return await dashboard_service.get_team_member_tasks(user, db)
+        return FastJSONResponse(await dashboard_service.get_team_member_tasks(user, db))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -1,16 +1,26 @@
 """
-Deal endpoints: getDeals, getDealsByPipeline, getDeal, createDeal, updateDeal, updateDealStage, deleteDeal
+Deal endpoints: getDeals, exportDeals, getDealsByPipeline, getDeal, createDeal, updateDeal, updateDealStage, deleteDeal
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from app.core.responses import FastJSONResponse
+from app.schemas.lists import DealListResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_db, UnitOfWorkRoute
 from utils.jwt import get_current_user
 from services.deal_service import DealService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
-@router.get("/")
-async def get_deals(user=Depends(get_current_user), stage: str = None):
+@router.get("/", response_model=DealListResponse)
+async def get_deals(user=Depends(get_current_user), stage: str = None,
+                    limit: int = Query(100, ge=1, le=500), offset: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
     """Get all deals for workspace."""
-    return await DealService.get_deals(user, stage)
+    return FastJSONResponse(await DealService.get_deals(user, db, stage, limit, offset))
+
+@router.get("/export")
+async def export_deals(user=Depends(get_current_user), format: str = Query("csv", pattern="^(csv|ndjson)$"), gzip: bool = False, stage: str = None):
+    """Export all matching deals as CSV or NDJSON."""
+    return DealService.export_deals(user, format, gzip, stage)
 
 @router.get("/pipeline")
 async def get_deals_by_pipeline(user=Depends(get_current_user)):
@@ -1,17 +1,28 @@
 """
-Task endpoints: getTasks, getMyTasks, getTask, createTask, updateTask, deleteTask, getFounderTasks, getAssignedTasks, getUnassignedTasks, getBeautifiedMessages
+Task endpoints: getTasks, exportTasks, getMyTasks, getTask, createTask, updateTask, deleteTask, getFounderTasks, getAssignedTasks, getUnassignedTasks, getBeautifiedMessages
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from app.core.responses import FastJSONResponse
+from app.schemas.lists import TaskListResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_db, UnitOfWorkRoute
 from utils.jwt import get_current_user
 from services.task_service import TaskService
 from services.ai_service import AIService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
-@router.get("/")
-async def get_tasks(user=Depends(get_current_user), status: str = None, assigned_to: int = None, category: str = None, priority: str = None):
+@router.get("/", response_model=TaskListResponse)
+async def get_tasks(user=Depends(get_current_user), status: str = None, assigned_to: int = None, category: str = None, priority: str = None,
+                    limit: int = Query(100, ge=1, le=500), offset: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
     """Get all tasks for workspace."""
-    return await TaskService.get_tasks(user, status, assigned_to, category, priority)
+    return FastJSONResponse(await TaskService.get_tasks(user, db, status, assigned_to, category, priority, limit, offset))
+
+@router.get("/export")
+async def export_tasks(user=Depends(get_current_user), format: str = Query("csv", pattern="^(csv|ndjson)$"), gzip: bool = False,
+                       status: str = None, assigned_to: int = None, category: str = None, priority: str = None):
+    """Export all matching tasks as CSV or NDJSON."""
+    return TaskService.export_tasks(user, format, gzip, status, assigned_to, category, priority)
 
 @router.get("/my-tasks")
 async def get_my_tasks(user=Depends(get_current_user)):
@@ -0,0 +1,91 @@
+"""Micro-benchmark JSON encoding of dashboard task payloads.
+
+Compares the previous response path (jsonable_encoder + stdlib json) with
+FastJSONResponse on the same payload shapes the dashboard endpoints return.
+
+Usage:
+    python scripts/bench_json.py [rows] [repeat]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.schemas.lists import DashboardTasksResponse
+from db.enums import TaskPriority, TaskStatus
+
+def task_rows(count: int):
+    """Task rows as loaded from the database (datetime/enum values)."""
+    now = datetime(2026, 10, 17, 9, 30, 15, 123456)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    return [
+        {
+            "id": i,
+            "title": f"Follow up with lead #{i} about the pilot proposal",
+            "description": "Send the revised pricing sheet and schedule a demo for the ops team." if i % 3 else None,
+            "status": statuses[i % len(statuses)],
+            "priority": priorities[i % len(priorities)],
+            "category": "sales" if i % 2 else "ops",
+            "due_date": now + timedelta(days=i % 30),
+            "assigned_to": i % 7 or None,
+            "contact_id": i * 3,
+            "deal_id": i * 5 if i % 4 else None,
+            "created_at": now - timedelta(days=i % 90),
+            "updated_at": now - timedelta(hours=i % 48) if i % 5 else None,
+        }
+        for i in range(count)
+    ]
+
+def dashboard_payload(rows):
+    return {"success": True, "data": {"todaysTasks": rows, "pipelineValue": Decimal("125000.50")}}
+
+def projected(rows):
+    """Rows as returned by services.crud.projection.fetch_rows."""
+    return [
+        {
+            key: value.isoformat() if isinstance(value, datetime)
+            else value.value if isinstance(value, (TaskStatus, TaskPriority))
+            else value
+            for key, value in row.items()
+        }
+        for row in rows
+    ]
+
+def main(count: int, repeat: int) -> None:
+    rows = task_rows(count)
+    payload = dashboard_payload(rows)
+    projected_payload = dashboard_payload(projected(rows))
+    model = DashboardTasksResponse.model_validate({"success": True, "data": {"todaysTasks": rows}})
+
+    cases = {
+        "jsonable_encoder + json (previous)": lambda: JSONResponse(jsonable_encoder(payload)),
+        "jsonable_encoder + FastJSONResponse": lambda: FastJSONResponse(jsonable_encoder(payload)),
+        "FastJSONResponse, raw values": lambda: FastJSONResponse(payload),
+        "FastJSONResponse, projected rows": lambda: FastJSONResponse(projected_payload),
+        "FastJSONResponse, validated model": lambda: FastJSONResponse(model),
+    }
+
+    # Every path must produce the same document
+    reference = json.loads(JSONResponse(jsonable_encoder(payload)).body)
+    for name in ("FastJSONResponse, raw values", "FastJSONResponse, projected rows"):
+        assert json.loads(cases[name]().body) == reference, name
+
+    print(f"{count} task rows, best of 5 x {repeat} renders\n")
+    baseline = None
+    for name, render in cases.items():
+        best = min(timeit.repeat(render, number=repeat, repeat=5)) / repeat
+        baseline = baseline or best
+        print(f"{name:<40} {best * 1000:8.3f} ms  {baseline / best:6.1f}x")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    main(count, repeat)
@@ -0,0 +1,147 @@
+"""Print query plans for the hot service queries and flag full table scans.
+
+Usage:
+    python scripts/explain_queries.py [workspace_id] [user_id]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import date, timedelta
+from sqlalchemy import select, desc, text
+from db.database import engine, init_db
+from db.models import Contact, Deal, Note, Task, User, Interaction, Tag, contact_tags
+from db.enums import TaskStatus, TaskPriority, DealStage, ContactType
+
+def hot_queries(workspace_id: int, user_id: int):
+    """Statements shaped like the service-layer queries they are named after."""
+    today = date.today()
+    return {
+        "TaskService.get_user_tasks": (
+            select(Task)
+            .where(Task.assigned_to == user_id, Task.workspace_id == workspace_id)
+            .order_by(Task.due_date, desc(Task.priority))
+        ),
+        "TaskService.get_overdue_tasks": (
+            select(Task)
+            .where(
+                Task.workspace_id == workspace_id,
+                Task.status != TaskStatus.COMPLETED,
+                Task.due_date < today
+            )
+            .order_by(Task.due_date)
+        ),
+        "TaskService.get_upcoming_tasks": (
+            select(Task)
+            .where(
+                Task.workspace_id == workspace_id,
+                Task.status != TaskStatus.COMPLETED,
+                Task.due_date >= today,
+                Task.due_date <= today + timedelta(days=7)
+            )
+            .order_by(Task.due_date, desc(Task.priority))
+        ),
+        "TaskService.get_tasks_by_entity": (
+            select(Task)
+            .where(Task.workspace_id == workspace_id, Task.contact_id == 1)
+            .order_by(Task.due_date, desc(Task.priority))
+        ),
+        "DashboardService.get_founder_tasks": (
+            select(Task)
+            .where(
+                Task.workspace_id == workspace_id,
+                Task.status != TaskStatus.COMPLETED,
+                Task.priority.in_([TaskPriority.HIGH, TaskPriority.URGENT])
+            )
+            .order_by(Task.due_date)
+        ),
+        "DashboardService.get_team_member_tasks": (
+            select(Task)
+            .where(
+                Task.workspace_id == workspace_id,
+                Task.assigned_to == user_id,
+                Task.status != TaskStatus.COMPLETED
+            )
+            .order_by(Task.due_date)
+        ),
+        "DealService.get_deals_by_stage": (
+            select(Deal)
+            .where(Deal.workspace_id == workspace_id, Deal.stage == DealStage.NEW)
+            .order_by(desc(Deal.updated_at))
+        ),
+        "DealService.get_deals_by_contact": (
+            select(Deal)
+            .where(Deal.contact_id == 1, Deal.workspace_id == workspace_id)
+            .order_by(desc(Deal.updated_at))
+        ),
+        "ContactService.get_contacts_by_type": (
+            select(Contact)
+            .where(Contact.workspace_id == workspace_id, Contact.type == ContactType.LEAD)
+        ),
+        "ContactService.contact_tags": (
+            select(contact_tags).where(contact_tags.c.contact_id == 1)
+        ),
+        "ContactService.update_tags": (
+            select(Tag.name, Tag.id)
+            .where(Tag.workspace_id == workspace_id, Tag.name.in_(["investor", "lead"]))
+        ),
+        "ContactService.interactions": (
+            select(Interaction)
+            .where(Interaction.contact_id == 1)
+            .order_by(desc(Interaction.interaction_date))
+        ),
+        "NoteService.get_recent_notes": (
+            select(Note)
+            .where(Note.workspace_id == workspace_id)
+            .order_by(desc(Note.created_at))
+            .limit(5)
+        ),
+        "NoteService.get_entity_notes": (
+            select(Note)
+            .where(Note.workspace_id == workspace_id, Note.contact_id == 1)
+            .order_by(desc(Note.created_at))
+        ),
+        "UserService.get_workspace_members": (
+            select(User).where(User.workspace_id == workspace_id)
+        ),
+    }
+
+def is_full_scan(dialect: str, plan: list) -> bool:
+    """Detect a full table scan in a plan."""
+    for line in plan:
+        if dialect == "sqlite":
+            # "SCAN tasks" is a full scan, "SCAN tasks USING INDEX ..." is not
+            if line.startswith("SCAN ") and "USING" not in line:
+                return True
+        elif "Seq Scan" in line:
+            return True
+    return False
+
+async def explain(workspace_id: int, user_id: int) -> int:
+    """Print the plan for every hot query and return the number of full scans."""
+    await init_db()
+    dialect = engine.dialect.name
+    full_scans = 0
+
+    async with engine.connect() as conn:
+        for name, query in hot_queries(workspace_id, user_id).items():
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+            result = await conn.execute(text(f"{prefix} {sql}"))
+            plan = [row[-1] for row in result]
+
+            flagged = is_full_scan(dialect, plan)
+            full_scans += flagged
+            print(f"\n{name}{'  <-- FULL SCAN' if flagged else ''}")
+            for line in plan:
+                print(f"    {line}")
+
+    await engine.dispose()
+    print(f"\n{full_scans} full table scan(s) found")
+    return full_scans
+
+if __name__ == "__main__":
+    workspace_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    user_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    sys.exit(1 if asyncio.run(explain(workspace_id, user_id)) else 0)
@@ -0,0 +1,27 @@
+"""Give notes without a sentiment one from the local lexicon analyzer.
+
+Needs no AI provider; notes analyzed later by the provider get its
+sentiment instead.
+
+Usage:
+    python scripts/fill_note_sentiment.py [batch_size]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from db.database import dispose_engines
+from services.ai.notes import fill_missing_sentiments
+
+async def main(batch_size=1000):
+    try:
+        started = time.perf_counter()
+        scored = await fill_missing_sentiments(batch_size)
+        print(f"Scored {scored} notes in {time.perf_counter() - started:.1f}s")
+    finally:
+        await dispose_engines()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,27 @@
+"""Rebuild the workspace dashboard counters from the tasks and deals tables.
+
+Run after bulk changes made outside the application (raw SQL, restores) or
+from cron as a safety net; the API also rebuilds them every
+COUNTERS_RECONCILE_INTERVAL seconds.
+
+Usage:
+    python scripts/reconcile_counters.py [workspace_id]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from db.database import dispose_engines
+from services.crud.counters import reconcile_counters
+
+async def main(workspace_id=None):
+    try:
+        rows = await reconcile_counters(workspace_id)
+        scope = f"workspace {workspace_id}" if workspace_id is not None else "all workspaces"
+        print(f"Rebuilt {rows} counters for {scope}")
+    finally:
+        await dispose_engines()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -3,8 +3,10 @@ AI services package.
 """
 from .config import ai_settings
 from .service import ai_service
+from .jobs import ai_job_queue
 
 __all__ = [
     "ai_settings",
-    "ai_service"
+    "ai_service",
+    "ai_job_queue"
 ]
\ No newline at end of file
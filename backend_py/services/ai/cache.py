@@ -0,0 +1,119 @@
+"""
+Content-addressed cache of AI API responses.
+
+The key is a hash of everything that determines the completion: model,
+messages and sampling parameters. Identical prompts, e.g. re-analyzing an
+unchanged note, are answered from an in-process LRU tier and, when
+AI_CACHE_PERSISTENT is set, from the ai_response_cache table shared by
+all processes. How long a response stays valid depends on the operation
+(AI_CACHE_TTLS).
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import orjson
+from sqlalchemy import select, delete
+
+from config import settings
+from app.core.metrics import AI_CACHE_REQUESTS
+from db.database import AsyncSessionLocal
+from db.models import AIResponseCache
+from services.crud.base import upsert_rows
+from services.crud.cache import QueryCache
+
+logger = logging.getLogger(__name__)
+
+# Persistent writes between purges of expired rows
+PURGE_EVERY = 100
+
+def cache_key(request: Dict[str, Any]) -> str:
+    """SHA-256 of a request body (model, messages, sampling params), independent of key order."""
+    return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class ResponseCache:
+    """Two-tier (memory, database) cache of API responses by request hash."""
+
+    def __init__(self, memory: QueryCache, ttls: Dict[str, int], persistent: bool):
+        self.memory = memory
+        self.ttls = ttls
+        self.persistent = persistent
+        self._writes = 0
+
+    def ttl(self, operation: Optional[str]) -> int:
+        """Seconds responses of an operation stay valid (0: not cached)."""
+        if not settings.AI_CACHE_ENABLED or operation is None:
+            return 0
+        return self.ttls.get(operation, 0)
+
+    async def get(self, key: str, operation: str) -> Optional[Dict[str, Any]]:
+        """Look up a response, memory tier first. Database hits are copied to memory."""
+        hit, response = self.memory.get(key)
+        if hit:
+            AI_CACHE_REQUESTS.labels(operation=operation, result="memory_hit").inc()
+            return response
+
+        if self.persistent:
+            try:
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        select(AIResponseCache.response, AIResponseCache.expires_at).where(
+                            AIResponseCache.cache_key == key,
+                            AIResponseCache.expires_at > datetime.utcnow()
+                        )
+                    )
+                    row = result.first()
+            except Exception:
+                logger.exception("AI response cache lookup failed")
+                row = None
+            if row:
+                response = orjson.loads(row.response)
+                remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+                self.memory.set(key, response, max(int(remaining), 1))
+                AI_CACHE_REQUESTS.labels(operation=operation, result="database_hit").inc()
+                return response
+
+        AI_CACHE_REQUESTS.labels(operation=operation, result="miss").inc()
+        return None
+
+    async def set(self, key: str, operation: str, response: Dict[str, Any]) -> None:
+        """Store a response in every tier for the operation's TTL."""
+        ttl = self.ttl(operation)
+        if ttl <= 0:
+            return
+        self.memory.set(key, response, ttl)
+        if not self.persistent:
+            return
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await upsert_rows(
+                    session,
+                    AIResponseCache,
+                    [{
+                        "cache_key": key,
+                        "operation": operation,
+                        "response": orjson.dumps(response).decode(),
+                        "expires_at": datetime.utcnow() + timedelta(seconds=ttl)
+                    }],
+                    index_elements=["cache_key"]
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY == 0:
+                    await session.execute(
+                        delete(AIResponseCache).where(AIResponseCache.expires_at <= datetime.utcnow())
+                    )
+                await session.commit()
+        except Exception:
+            # The cache must never fail the request that produced the response
+            logger.exception("AI response cache write failed")
+
+ai_response_cache = ResponseCache(
+    memory=QueryCache(
+        max_entries=settings.AI_CACHE_MAX_ENTRIES,
+        max_bytes=settings.AI_CACHE_MAX_BYTES,
+        default_ttl=max(settings.AI_CACHE_TTLS.values(), default=60) or 60
+    ),
+    ttls=settings.AI_CACHE_TTLS,
+    persistent=settings.AI_CACHE_PERSISTENT
+)
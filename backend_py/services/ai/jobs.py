@@ -0,0 +1,178 @@
+"""
+In-process queue for long-running AI operations.
+
+Instead of holding an HTTP worker for the provider round trip, a route can
+persist a job record and answer 202 with its id. A fixed number of worker
+tasks run queued jobs (AIService calls, note re-analysis), store the
+result (or error) on the record and notify the requesting user over the
+WebSocket connection.
+
+Job records outlive the process: jobs still queued at startup are picked
+up again, and claiming a job is atomic, so several processes can share
+the table without running a job twice.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import orjson
+from fastapi import HTTPException
+
+from config import settings
+from app.core.responses import dumps
+from app.schemas.websocket import WebSocketMessageType
+from db.database import AsyncSessionLocal
+from services.crud.ai_job import ai_job_service, JOB_COMPLETED, JOB_FAILED, JOB_QUEUED
+from utils.websocket import manager
+from .limiter import current_workspace_id
+from .notes import refresh_note_analyses
+from .service import ai_service
+
+logger = logging.getLogger(__name__)
+
+# Operations that may run as background jobs
+JOB_OPERATIONS: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "analyze_contact_note": ai_service.analyze_contact_note,
+    "prioritize_tasks": ai_service.prioritize_tasks,
+    "generate_email": ai_service.generate_email,
+    "summarize_entity": ai_service.summarize_entity,
+    "refresh_note_analyses": refresh_note_analyses,
+}
+
+class AIJobQueue:
+    """Bounded asyncio queue of AI job IDs served by a pool of workers."""
+
+    def __init__(self, workers: int, max_size: int, timeout: int):
+        self.workers = workers
+        self.max_size = max_size
+        self.timeout = timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the workers and re-queue jobs left over from a previous run."""
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        async with AsyncSessionLocal() as session:
+            stale = await ai_job_service.fail_stale(
+                session, datetime.utcnow() - timedelta(seconds=self.timeout)
+            )
+            queued = await ai_job_service.get_queued_ids(session)
+        if stale:
+            logger.warning("Marked %d interrupted AI jobs as failed", stale)
+        for job_id in queued[:self.max_size]:
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers. Unfinished jobs stay queued for the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def submit(
+        self,
+        operation: str,
+        *args: Any,
+        workspace_id: int,
+        user_id: int,
+        **kwargs: Any
+    ) -> str:
+        """
+        Persist a job and queue it.
+        Args:
+            operation: Name of an operation in JOB_OPERATIONS
+            *args, **kwargs: JSON-serializable arguments for the method
+            workspace_id: Workspace the job belongs to
+            user_id: User notified on completion
+        Returns:
+            str: Job ID
+        """
+        if operation not in JOB_OPERATIONS:
+            raise ValueError(f"Unknown AI job operation '{operation}'")
+        if self._queue is None or self._queue.full():
+            raise HTTPException(status_code=503, detail="AI job queue is full, try again later")
+
+        job_id = uuid.uuid4().hex
+        async with AsyncSessionLocal() as session:
+            await ai_job_service.create(session, obj_in={
+                "id": job_id,
+                "operation": operation,
+                "status": JOB_QUEUED,
+                "payload": dumps({"args": args, "kwargs": kwargs}).decode(),
+                "workspace_id": workspace_id,
+                "user_id": user_id
+            })
+
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            # Filled up while the record was being written
+            async with AsyncSessionLocal() as session:
+                await ai_job_service.finish(session, job_id, error="AI job queue is full")
+            raise HTTPException(status_code=503, detail="AI job queue is full, try again later")
+        return job_id
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("AI job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        """Claim, execute and record one job."""
+        async with AsyncSessionLocal() as session:
+            job = await ai_job_service.claim(session, job_id)
+        if job is None:
+            return  # Taken by another process
+
+        current_workspace_id.set(job.workspace_id)
+        result = error = None
+        try:
+            payload = orjson.loads(job.payload)
+            method = JOB_OPERATIONS[job.operation]
+            value = await asyncio.wait_for(
+                method(*payload["args"], **payload["kwargs"]), self.timeout
+            )
+            result = dumps(value).decode()
+        except asyncio.TimeoutError:
+            error = f"Timed out after {self.timeout} seconds"
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        async with AsyncSessionLocal() as session:
+            await ai_job_service.finish(session, job_id, result=result, error=error)
+
+        message_type = (
+            WebSocketMessageType.AI_JOB_FAILED if error is not None
+            else WebSocketMessageType.AI_JOB_COMPLETED
+        )
+        await manager.send_to_user(
+            str(job.workspace_id),
+            str(job.user_id),
+            {
+                "type": message_type.value,
+                "payload": {
+                    "job_id": job_id,
+                    "operation": job.operation,
+                    "status": JOB_FAILED if error is not None else JOB_COMPLETED,
+                    "result": orjson.loads(result) if result is not None else None,
+                    "error": error
+                }
+            }
+        )
+
+ai_job_queue = AIJobQueue(
+    workers=settings.AI_JOB_WORKERS,
+    max_size=settings.AI_JOB_QUEUE_SIZE,
+    timeout=settings.AI_JOB_TIMEOUT
+)
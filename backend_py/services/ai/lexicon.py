@@ -0,0 +1,79 @@
+"""
+Bundled word lists for the local note analyzer.
+
+Weights run from -3 (strongly negative) to 3 (strongly positive) and are
+tuned for sales and customer notes rather than general text: "churn",
+"blocker" or "budget cut" weigh more than in a generic lexicon.
+"""
+from typing import Dict, FrozenSet
+
+SENTIMENT_LEXICON: Dict[str, float] = {
+    # Positive
+    "accept": 1.5, "accepted": 1.5, "agree": 1.5, "agreed": 1.5,
+    "amazing": 3, "appreciate": 2, "appreciated": 2, "approve": 2,
+    "approved": 2, "awesome": 3, "benefit": 1.5, "best": 2.5,
+    "brilliant": 3, "champion": 2, "confident": 2, "congrats": 2.5,
+    "congratulations": 2.5, "delighted": 3, "easy": 1, "effective": 1.5,
+    "enjoy": 2, "enjoyed": 2, "enthusiastic": 2.5, "excellent": 3,
+    "excited": 2.5, "exciting": 2.5, "expand": 1.5, "expansion": 1.5,
+    "fantastic": 3, "fast": 1, "favorable": 2, "fit": 1, "glad": 2,
+    "good": 1.5, "grateful": 2, "great": 2.5, "grow": 1.5, "growth": 1.5,
+    "happy": 2.5, "helpful": 2, "impressed": 2.5, "improve": 1.5,
+    "improved": 1.5, "interested": 1.5, "keen": 1.5, "like": 1,
+    "liked": 1.5, "love": 3, "loved": 3, "loves": 3, "nice": 1.5,
+    "opportunity": 1.5, "perfect": 3, "pleased": 2.5, "positive": 2,
+    "progress": 1.5, "promising": 2, "recommend": 2, "referral": 1.5,
+    "renew": 2, "renewal": 1.5, "renewed": 2, "resolved": 1.5,
+    "satisfied": 2, "signed": 2.5, "smooth": 1.5, "solid": 1.5,
+    "strong": 1.5, "success": 2.5, "successful": 2.5, "supportive": 2,
+    "thank": 1.5, "thanks": 1.5, "thrilled": 3, "upgrade": 2,
+    "upsell": 2, "useful": 1.5, "valuable": 2, "win": 2.5, "won": 2.5,
+    "wonderful": 3, "yes": 1,
+    # Negative
+    "angry": -3, "annoyed": -2, "bad": -2, "blocked": -2, "blocker": -2,
+    "broken": -2.5, "bug": -1.5, "bugs": -1.5, "cancel": -2.5,
+    "cancelled": -2.5, "cancellation": -2.5, "churn": -3, "churned": -3,
+    "competitor": -1, "complain": -2, "complained": -2, "complaint": -2,
+    "concern": -1.5, "concerned": -1.5, "concerns": -1.5, "confused": -1.5,
+    "costly": -1.5, "cut": -1, "decline": -2, "declined": -2,
+    "delay": -1.5, "delayed": -1.5, "difficult": -1.5, "disappointed": -2.5,
+    "disappointing": -2.5, "dissatisfied": -2.5, "downgrade": -2,
+    "error": -1.5, "errors": -1.5, "escalate": -2, "escalated": -2,
+    "expensive": -1.5, "fail": -2.5, "failed": -2.5, "failure": -2.5,
+    "frustrated": -2.5, "frustrating": -2.5, "ghosted": -2.5, "hate": -3,
+    "hesitant": -1.5, "issue": -1, "issues": -1, "lost": -2.5,
+    "negative": -2, "no": -1, "objection": -1.5, "outage": -2.5,
+    "overdue": -1.5, "pause": -1, "paused": -1.5, "poor": -2,
+    "problem": -1.5, "problems": -1.5, "refund": -2, "reject": -2.5,
+    "rejected": -2.5, "risk": -1.5, "risky": -1.5, "slow": -1.5,
+    "stalled": -2, "stuck": -1.5, "terrible": -3, "threaten": -2.5,
+    "threatened": -2.5, "unhappy": -2.5, "unresponsive": -2,
+    "upset": -2.5, "worried": -2, "worse": -2, "worst": -3,
+}
+
+# Words that flip the sentiment of the word right after them ("not happy")
+NEGATIONS: FrozenSet[str] = frozenset({
+    "not", "no", "never", "without", "hardly", "barely", "cannot", "cant",
+    "can't", "dont", "don't", "didnt", "didn't", "doesnt", "doesn't",
+    "isnt", "isn't", "wasnt", "wasn't", "wont", "won't", "arent", "aren't",
+    "wouldnt", "wouldn't", "nor",
+})
+
+# Words never reported as keywords
+STOPWORDS: FrozenSet[str] = frozenset({
+    "a", "about", "above", "after", "again", "all", "also", "am", "an",
+    "and", "any", "are", "as", "at", "be", "been", "before", "being",
+    "below", "between", "both", "but", "by", "call", "called", "can",
+    "could", "did", "do", "does", "doing", "down", "during", "each",
+    "email", "few", "for", "from", "further", "get", "got", "had", "has",
+    "have", "having", "he", "her", "here", "hers", "him", "his", "how",
+    "i", "if", "in", "into", "is", "it", "its", "just", "let", "me",
+    "meeting", "more", "most", "my", "need", "needs", "next", "note", "of",
+    "off", "on", "once", "one", "only", "or", "other", "our", "ours",
+    "out", "over", "own", "said", "same", "she", "should", "so", "some",
+    "such", "than", "that", "the", "their", "them", "then", "there",
+    "these", "they", "this", "those", "through", "to", "too", "under",
+    "until", "up", "us", "very", "via", "want", "wants", "was", "we",
+    "week", "were", "what", "when", "where", "which", "while", "who",
+    "whom", "why", "will", "with", "would", "you", "your", "yours",
+}) | NEGATIONS
@@ -0,0 +1,159 @@
+"""
+Admission control for AI provider calls.
+
+Every call first takes a token from its model's token bucket, then a slot
+of the global concurrency semaphore. Callers waiting for a token are
+queued per workspace and served round-robin, so one workspace's burst
+cannot starve the others. A 429/503 answer blocks the model's bucket for
+the Retry-After period.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from config import settings
+from app.core.metrics import AI_LIMITER_QUEUE_DEPTH, AI_LIMITER_WAIT, AI_PROVIDER_THROTTLED
+
+# Workspace the current AI call is made for (fair queueing key)
+current_workspace_id: ContextVar[Optional[int]] = ContextVar("ai_workspace_id", default=None)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds until a token can be taken (0 if one is available now)."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds`, then one at once and the rest at the normal rate."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = min(1.0, self.tokens)
+        self.updated = self.blocked_until
+
+class FairQueue:
+    """Waiters for one model's tokens, served round-robin across workspaces."""
+
+    def __init__(self, model: str, bucket: TokenBucket):
+        self.model = model
+        self.bucket = bucket
+        self._waiters: "OrderedDict[Any, Deque[asyncio.Future]]" = OrderedDict()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def acquire(self, workspace_id: Any) -> None:
+        """Wait for a token, behind earlier waiters of the same workspace."""
+        if not self._waiters and self.bucket.delay() == 0:
+            self.bucket.take()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(workspace_id, deque()).append(future)
+        AI_LIMITER_QUEUE_DEPTH.labels(model=self.model).inc()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A token handed over at the same moment is lost; the dispatcher
+            # skips futures that are already cancelled
+            future.cancel()
+            raise
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            delay = self.bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            future = self._next_waiter()
+            if future is not None:
+                self.bucket.take()
+                future.set_result(None)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the oldest waiter of the next workspace in turn (None if it gave up)."""
+        workspace_id, waiters = next(iter(self._waiters.items()))
+        future = waiters.popleft()
+        if waiters:
+            self._waiters.move_to_end(workspace_id)
+        else:
+            del self._waiters[workspace_id]
+        AI_LIMITER_QUEUE_DEPTH.labels(model=self.model).dec()
+        return None if future.done() else future
+
+class AIRateLimiter:
+    """Per-model token buckets with fair queues behind one global semaphore."""
+
+    def __init__(self, max_concurrency: int, rates: Dict[str, float], default_rate: float, burst: int):
+        self.rates = rates
+        self.default_rate = default_rate
+        self.burst = burst
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: Dict[str, FairQueue] = {}
+
+    def _queue(self, model: str) -> FairQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            per_minute = self.rates.get(model, self.default_rate)
+            queue = self._queues[model] = FairQueue(model, TokenBucket(per_minute / 60, self.burst))
+        return queue
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """
+        Hold permission for one provider call.
+        Args:
+            model: Model the call is made to (selects the rate limit)
+        """
+        started = time.monotonic()
+        await self._queue(model).acquire(current_workspace_id.get())
+        async with self._semaphore:
+            AI_LIMITER_WAIT.labels(model=model).observe(time.monotonic() - started)
+            yield
+
+    def backoff(self, model: str, seconds: float) -> None:
+        """Stop issuing calls to a model for `seconds` after the provider throttled us."""
+        AI_PROVIDER_THROTTLED.labels(model=model).inc()
+        self._queue(model).bucket.block(seconds)
+
+ai_rate_limiter = AIRateLimiter(
+    max_concurrency=settings.AI_MAX_CONCURRENCY,
+    rates=settings.AI_RATE_LIMITS,
+    default_rate=settings.AI_DEFAULT_RATE_LIMIT,
+    burst=settings.AI_RATE_BURST
+)
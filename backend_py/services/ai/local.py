@@ -0,0 +1,126 @@
+"""
+Local sentiment and keyword analysis of notes.
+
+Scores notes against the bundled lexicon (lexicon.py) without calling the
+provider, so sentiment is available when AI features are off or the
+provider is slow. A batch is tokenized once; the scoring, negation and
+keyword ranking then run as NumPy array operations over all tokens of
+the batch, which handles thousands of notes per second.
+"""
+import re
+from typing import Any, Dict, FrozenSet, List, Mapping, Sequence
+import numpy as np
+
+from .lexicon import NEGATIONS, SENTIMENT_LEXICON, STOPWORDS
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']*")
+
+# Normalizes summed word weights into (-1, 1), as in VADER
+NORMALIZATION_ALPHA = 15.0
+
+# Normalized score beyond which a note is positive or negative
+NEUTRAL_THRESHOLD = 0.05
+
+# Notes whose weaker side has at least this share of the stronger one are mixed
+MIXED_RATIO = 0.5
+
+class LexiconAnalyzer:
+    """Lexicon-based sentiment scoring and TF-IDF keywords for batches of notes."""
+
+    def __init__(
+        self,
+        lexicon: Mapping[str, float],
+        negations: FrozenSet[str],
+        stopwords: FrozenSet[str],
+        keywords: int = 5
+    ):
+        self.lexicon = lexicon
+        self.negations = negations
+        self.stopwords = stopwords
+        self.keywords = keywords
+
+    def analyze(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze a batch of texts.
+        Args:
+            texts: Note contents
+        Returns:
+            List[Dict[str, Any]]: Per text, in order: sentiment (positive,
+                neutral, negative or mixed), score in (-1, 1) and keywords
+        """
+        count = len(texts)
+        if count == 0:
+            return []
+
+        token_lists = [TOKEN_PATTERN.findall((text or "").lower()) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=count)
+        doc_ids = np.repeat(np.arange(count), lengths)
+        words = [token for tokens in token_lists for token in tokens]
+        if not words:
+            return [{"sentiment": "neutral", "score": 0.0, "keywords": []} for _ in texts]
+
+        # Per distinct word of the batch, looked up once
+        vocabulary, word_ids = np.unique(np.array(words), return_inverse=True)
+        vocabulary = vocabulary.tolist()
+        lexicon_weights = np.array([self.lexicon.get(word, 0.0) for word in vocabulary])
+        is_negation = np.array([word in self.negations for word in vocabulary])
+        is_keyword = np.array(
+            [len(word) > 2 and word not in self.stopwords for word in vocabulary]
+        )
+
+        # A negation flips the next word of the same note
+        weights = lexicon_weights[word_ids]
+        negated = np.zeros(len(words), dtype=bool)
+        negated[1:] = is_negation[word_ids[:-1]] & (doc_ids[1:] == doc_ids[:-1])
+        weights = np.where(negated, -weights, weights)
+
+        positive = np.bincount(doc_ids, weights=np.maximum(weights, 0), minlength=count)
+        negative = np.bincount(doc_ids, weights=np.minimum(weights, 0), minlength=count)
+        total = positive + negative
+        scores = total / np.sqrt(total * total + NORMALIZATION_ALPHA)
+
+        labels = np.full(count, "neutral", dtype=object)
+        labels[scores >= NEUTRAL_THRESHOLD] = "positive"
+        labels[scores <= -NEUTRAL_THRESHOLD] = "negative"
+        weaker = np.minimum(positive, -negative)
+        stronger = np.maximum(positive, -negative)
+        labels[(weaker > 0) & (weaker >= MIXED_RATIO * stronger)] = "mixed"
+
+        keywords = self._keywords(count, doc_ids, word_ids, is_keyword, vocabulary)
+        return [
+            {"sentiment": label, "score": round(float(score), 4), "keywords": words_of_doc}
+            for label, score, words_of_doc in zip(labels, scores, keywords)
+        ]
+
+    def _keywords(
+        self,
+        count: int,
+        doc_ids: np.ndarray,
+        word_ids: np.ndarray,
+        is_keyword: np.ndarray,
+        vocabulary: List[str]
+    ) -> List[List[str]]:
+        """Top words of each note by TF-IDF over the batch (term frequency for a single note)."""
+        candidates = is_keyword[word_ids]
+        size = len(vocabulary)
+        pairs, term_counts = np.unique(
+            doc_ids[candidates] * size + word_ids[candidates], return_counts=True
+        )
+        pair_docs, pair_words = np.divmod(pairs, size)
+        document_counts = np.bincount(pair_words, minlength=size)
+        idf = np.log((1 + count) / (1 + document_counts)) + 1
+        scores = term_counts * idf[pair_words]
+
+        # Best first within each note; ties keep the alphabetical order of np.unique
+        order = np.lexsort((-scores, pair_docs))
+        pair_docs, pair_words = pair_docs[order], pair_words[order]
+        starts = np.searchsorted(pair_docs, np.arange(count))
+        ranks = np.arange(len(pair_docs)) - starts[pair_docs]
+        top = ranks < self.keywords
+
+        keywords: List[List[str]] = [[] for _ in range(count)]
+        for doc, word in zip(pair_docs[top].tolist(), pair_words[top].tolist()):
+            keywords[doc].append(vocabulary[word])
+        return keywords
+
+lexicon_analyzer = LexiconAnalyzer(SENTIMENT_LEXICON, NEGATIONS, STOPWORDS)
@@ -0,0 +1,198 @@
+"""
+AI analyses stored on notes.
+
+A note's summary, sentiment and action items are kept on the note with a
+hash of the content they were made from. Views of an unchanged note are
+answered from the database; only notes never analyzed or whose content
+changed are sent to the provider. Notes edited after their analysis are
+re-analyzed in the background by run_note_analysis_refresh(), so the
+next view finds a current analysis.
+
+Sentiment alone can also come from the local lexicon analyzer
+(fill_sentiments), without the provider.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from db.database import AsyncSessionLocal
+from db.models import Note
+from services.crud import note_service
+from .limiter import current_workspace_id
+from .local import lexicon_analyzer
+from .service import ai_service
+
+logger = logging.getLogger(__name__)
+
+async def analyze_notes(
+    db: AsyncSession,
+    notes: Sequence[Note],
+    *,
+    force: bool = False,
+    timeout: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Analyses of notes: stored ones where still current, the others made
+    with as few provider requests as fit the batch token budget and
+    stored on their notes.
+    Args:
+        db: AsyncSession
+        notes: Notes with contact and deal loaded
+        force: Re-analyze notes whose stored analysis is current
+        timeout: Seconds to wait for the provider (None: no limit); raises
+            asyncio.TimeoutError before anything is stored
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: One result per note, in order,
+            flagged "cached" when it came from the database, and the
+            number of provider requests made
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    stale = []
+    for note in notes:
+        if not force and note_service.analysis_is_current(note):
+            results[note.id] = {**note_service.stored_analysis(note), "cached": True}
+        else:
+            stale.append(note)
+    if not stale:
+        return [results[note.id] for note in notes], 0
+
+    analyses = await asyncio.wait_for(
+        ai_service.analyze_notes([note_service.analysis_data(note) for note in stale]),
+        timeout
+    )
+    await note_service.save_analyses(db, [
+        {"id": note.id, "workspace_id": note.workspace_id, "content": note.content, **analysis}
+        for note, analysis in zip(stale, analyses)
+        if "error" not in analysis
+    ])
+
+    prompts = len({analysis.pop("batch") for analysis in analyses})
+    for analysis in analyses:
+        results[analysis["note_id"]] = {**analysis, "cached": False}
+    return [results[note.id] for note in notes], prompts
+
+async def fill_sentiments(
+    db: AsyncSession,
+    notes: Sequence[Note]
+) -> List[Dict[str, Any]]:
+    """
+    Score notes with the local lexicon analyzer and store their sentiment.
+    Args:
+        db: AsyncSession
+        notes: Notes to score
+    Returns:
+        List[Dict[str, Any]]: Per note, in order: note_id, sentiment, score and keywords
+    """
+    results = lexicon_analyzer.analyze([note.content for note in notes])
+    await note_service.save_sentiments(db, [
+        {
+            "id": note.id,
+            "workspace_id": note.workspace_id,
+            "content": note.content,
+            "sentiment": result["sentiment"]
+        }
+        for note, result in zip(notes, results)
+    ])
+    return [{"note_id": note.id, **result} for note, result in zip(notes, results)]
+
+async def fill_missing_sentiments(batch_size: int = 1000) -> int:
+    """
+    Give every note without a sentiment one from the local lexicon
+    analyzer, one committed batch at a time.
+    Args:
+        batch_size: Notes per batch
+    Returns:
+        int: Number of notes scored
+    """
+    scored = 0
+    after_id = 0
+    async with AsyncSessionLocal() as session:
+        while True:
+            rows = await note_service.get_notes_without_sentiment(
+                session, after_id=after_id, limit=batch_size
+            )
+            if not rows:
+                return scored
+            results = lexicon_analyzer.analyze([row["content"] for row in rows])
+            await note_service.save_sentiments(session, [
+                {**row, "sentiment": result["sentiment"]}
+                for row, result in zip(rows, results)
+            ])
+            scored += len(rows)
+            after_id = rows[-1]["id"]
+
+async def refresh_note_analyses(
+    note_ids: List[int],
+    workspace_id: int,
+    force: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Analyze notes of a workspace in a session of their own (the
+    background job behind POST /ai/analyze-note?background=true).
+    Args:
+        note_ids: Note IDs
+        workspace_id: Workspace the notes belong to
+        force: Re-analyze notes whose stored analysis is current
+    Returns:
+        List[Dict[str, Any]]: One result per found note
+    """
+    async with AsyncSessionLocal() as session:
+        notes = await note_service.get_notes_for_analysis(session, note_ids, workspace_id)
+        results, _ = await analyze_notes(session, notes, force=force)
+    return results
+
+async def refresh_edited_notes(limit: Optional[int] = None) -> int:
+    """
+    Re-analyze notes edited since their stored analysis was made. Notes
+    whose content did not change (another column was edited) only have
+    their analysis time moved forward.
+    Args:
+        limit: Maximum notes per run (NOTE_ANALYSIS_REFRESH_LIMIT by default)
+    Returns:
+        int: Number of notes sent to the provider
+    """
+    if not ai_service.enabled:
+        return 0
+
+    async with AsyncSessionLocal() as session:
+        notes = await note_service.get_edited_analyzed_notes(
+            session, limit=limit or settings.NOTE_ANALYSIS_REFRESH_LIMIT
+        )
+        unchanged = [note for note in notes if note_service.analysis_is_current(note)]
+        await note_service.save_analyses(session, [
+            {
+                "id": note.id,
+                "workspace_id": note.workspace_id,
+                "content": note.content,
+                **note_service.stored_analysis(note)
+            }
+            for note in unchanged
+        ])
+
+        by_workspace: Dict[int, List[Note]] = {}
+        for note in notes:
+            if note not in unchanged:
+                by_workspace.setdefault(note.workspace_id, []).append(note)
+        for workspace_id, edited in by_workspace.items():
+            # Queue each workspace's requests under its own name in the rate limiter
+            current_workspace_id.set(workspace_id)
+            await analyze_notes(session, edited, force=True)
+        current_workspace_id.set(None)
+    return sum(len(edited) for edited in by_workspace.values())
+
+async def run_note_analysis_refresh(interval: Optional[int] = None) -> None:
+    """
+    Background loop re-analyzing edited notes every `interval` seconds
+    (NOTE_ANALYSIS_REFRESH_INTERVAL by default).
+    """
+    interval = interval or settings.NOTE_ANALYSIS_REFRESH_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            refreshed = await refresh_edited_notes()
+            if refreshed:
+                logger.info("Re-analyzed %d edited notes", refreshed)
+        except Exception:
+            logger.exception("Re-analysis of edited notes failed")
@@ -1,12 +1,27 @@
 """
 Base AI service implementation using Perplexity API.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
+import asyncio
+import importlib.util
 import httpx
+import orjson
 from datetime import datetime
 from fastapi import HTTPException
 
 from config import settings
+from .cache import ai_response_cache, cache_key
+from .limiter import ai_rate_limiter, parse_retry_after
+from .local import lexicon_analyzer
+
+# Sentiment labels stored on notes
+SENTIMENTS = ("positive", "neutral", "negative", "mixed")
+
+# Rough size of a token in characters, for packing prompts
+CHARS_PER_TOKEN = 4
+
+# Completion tokens reserved per note of a batch
+BATCH_TOKENS_PER_NOTE = 200
 
 class AIService:
     def __init__(self):
@@ -14,6 +29,48 @@ class AIService:
         self.base_url = "https://api.perplexity.ai"
         self.default_model = settings.PERPLEXITY_MODEL
         self.enabled = settings.ENABLE_AI_FEATURES
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client with explicit timeouts and connection limits."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            # HTTP/2 needs the h2 package (httpx[http2]); HTTP/1.1 otherwise
+            http2=settings.AI_HTTP2 and importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(
+                connect=settings.AI_HTTP_CONNECT_TIMEOUT,
+                read=settings.AI_HTTP_READ_TIMEOUT,
+                write=settings.AI_HTTP_WRITE_TIMEOUT,
+                pool=settings.AI_HTTP_POOL_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+
+    async def start(self) -> None:
+        """Open the shared HTTP client (called from the app lifespan)."""
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, created on first use outside the app (scripts, jobs)."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
     
     def _check_enabled(self):
         """Check if AI features are enabled."""
@@ -30,26 +87,26 @@ class AIService:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        top_p: Optional[float] = None
+        top_p: Optional[float] = None,
+        operation: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Make a request to Perplexity API.
+        Responses are cached by a hash of the request body for the TTL
+        configured for `operation` (AI_CACHE_TTLS). Calls wait for the
+        rate limiter; throttled calls are retried after Retry-After.
         Args:
             messages: List of message dictionaries
             model: Model to use
             temperature: Temperature for response generation
             max_tokens: Maximum tokens in response
             top_p: Top p sampling parameter
+            operation: Calling operation, selects the cache TTL (None: not cached)
         Returns:
             Dict[str, Any]: API response
         """
         self._check_enabled()
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         data = {
             "model": model or self.default_model,
             "messages": messages,
@@ -57,15 +114,190 @@ class AIService:
             "max_tokens": max_tokens or 1024,   # Default max tokens
             "top_p": top_p or 0.9              # Default top p
         }
+
+        cacheable = ai_response_cache.ttl(operation) > 0
+        if cacheable:
+            key = cache_key(data)
+            cached = await ai_response_cache.get(key, operation)
+            if cached is not None:
+                return cached
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data
-            )
-            response.raise_for_status()
-            return response.json()
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            async with ai_rate_limiter.slot(data["model"]):
+                response = await self.client.post("/chat/completions", json=data)
+            if response.status_code not in (429, 503) or attempt == settings.AI_MAX_RETRIES:
+                break
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            ai_rate_limiter.backoff(data["model"], delay if delay is not None else 2 ** attempt)
+        response.raise_for_status()
+        result = response.json()
+
+        if cacheable:
+            await ai_response_cache.set(key, operation, result)
+        return result
+
+    async def _stream_request(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Make a streaming request to Perplexity API and yield the completion
+        as it is generated. The call holds its rate limiter slot until the
+        stream ends; closing the generator (e.g. when the client went away)
+        closes the upstream response.
+        Args:
+            messages: List of message dictionaries
+            model: Model to use
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens in response
+            top_p: Top p sampling parameter
+        Yields:
+            str: Pieces of the completion text
+        """
+        data = {
+            "model": model or self.default_model,
+            "messages": messages,
+            "temperature": temperature or 0.7,
+            "max_tokens": max_tokens or 1024,
+            "top_p": top_p or 0.9,
+            "stream": True
+        }
+
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            async with ai_rate_limiter.slot(data["model"]):
+                async with self.client.stream("POST", "/chat/completions", json=data) as response:
+                    if response.status_code not in (429, 503) or attempt == settings.AI_MAX_RETRIES:
+                        if response.is_error:
+                            await response.aread()
+                            response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            payload = line[len("data:"):].strip()
+                            if payload == "[DONE]":
+                                return
+                            choices = orjson.loads(payload).get("choices") or [{}]
+                            content = (choices[0].get("delta") or {}).get("content")
+                            if content:
+                                yield content
+                        return
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+            ai_rate_limiter.backoff(data["model"], delay if delay is not None else 2 ** attempt)
+
+    def _format_note(self, note_data: Dict[str, Any]) -> str:
+        """One note of a batch prompt."""
+        return (
+            f"Note ID: {note_data['note_id']}\n"
+            f"Contact: {note_data['context'].get('contact', {}).get('name', 'Unknown')}\n"
+            f"Company: {note_data['context'].get('contact', {}).get('company', 'Unknown')}\n"
+            f"Note Type: {note_data['type']}\n"
+            f"Date: {note_data['created_at']}\n"
+            f"Note Content: {note_data['content']}\n"
+        )
+
+    def _pack_notes(self, notes: List[str]) -> List[List[int]]:
+        """
+        Group formatted notes into as few batches as fit the token budget.
+        Args:
+            notes: Formatted notes
+        Returns:
+            List[List[int]]: Indexes of the notes in each batch; a note over
+                the budget on its own gets a batch of its own
+        """
+        budget = settings.AI_BATCH_TOKEN_BUDGET
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        used = 0
+        for index, note in enumerate(notes):
+            tokens = len(note) // CHARS_PER_TOKEN + 1
+            if batch and (used + tokens > budget or len(batch) >= settings.AI_BATCH_MAX_NOTES):
+                batches.append(batch)
+                batch, used = [], 0
+            batch.append(index)
+            used += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _parse_batch(self, content: str) -> Dict[int, Dict[str, Any]]:
+        """
+        Per-note results from a batch answer (a JSON array, possibly wrapped
+        in prose or a code fence).
+        Returns:
+            Dict[int, Dict[str, Any]]: Note ID -> summary, sentiment and action items
+        """
+        start, end = content.find("["), content.rfind("]")
+        if start < 0 or end < start:
+            raise ValueError("AI response contains no JSON array")
+        results = {}
+        for item in orjson.loads(content[start:end + 1]):
+            if not isinstance(item, dict) or "note_id" not in item:
+                continue
+            sentiment = str(item.get("sentiment", "")).lower()
+            results[int(item["note_id"])] = {
+                "summary": item.get("summary") or "",
+                "sentiment": sentiment if sentiment in SENTIMENTS else None,
+                "action_items": item.get("action_items") or []
+            }
+        return results
+
+    async def _analyze_batch(self, notes: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Analyze one batch of formatted notes with a single request."""
+        messages = [
+            {"role": "system", "content": self._format_system_prompt("analyzer")},
+            {"role": "user", "content": (
+                "Analyze each of these contact notes. Answer only with a JSON array "
+                "holding one object per note with the keys note_id, summary (one or "
+                "two sentences), sentiment (one of " + ", ".join(SENTIMENTS) + ") "
+                "and action_items (a list of strings).\n\n" + "\n".join(notes)
+            )}
+        ]
+        response = await self._make_request(
+            messages,
+            temperature=0.2,
+            max_tokens=BATCH_TOKENS_PER_NOTE * len(notes) + 100,
+            operation="analyze_notes"
+        )
+        return self._parse_batch(response["choices"][0]["message"]["content"])
+
+    async def analyze_notes(self, notes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze many notes, packing them into as few requests as fit
+        AI_BATCH_TOKEN_BUDGET. Batches are sent concurrently.
+        Args:
+            notes: Note data with context, as for analyze_contact_note
+        Returns:
+            List[Dict[str, Any]]: One result per note, in order, with summary,
+                sentiment and action_items (or error if its batch failed) and
+                the number of the batch (request) it was sent in
+        """
+        self._check_enabled()
+        formatted = [self._format_note(note) for note in notes]
+        batches = self._pack_notes(formatted)
+        answers = await asyncio.gather(
+            *(self._analyze_batch([formatted[i] for i in batch]) for batch in batches),
+            return_exceptions=True
+        )
+
+        analyzed_at = datetime.utcnow().isoformat()
+        results: List[Dict[str, Any]] = [None] * len(notes)
+        for number, (batch, answer) in enumerate(zip(batches, answers)):
+            for index in batch:
+                note_id = notes[index]["note_id"]
+                if isinstance(answer, Exception):
+                    error = str(answer.detail) if isinstance(answer, HTTPException) else str(answer)
+                    result = {"error": error or type(answer).__name__}
+                elif note_id not in answer:
+                    result = {"error": "Missing from AI response"}
+                else:
+                    result = {**answer[note_id], "analyzed_at": analyzed_at}
+                results[index] = {"note_id": note_id, **result, "batch": number}
+        return results
 
     def _format_system_prompt(self, role: str) -> str:
         """Format system prompt for different AI roles."""
@@ -96,12 +328,42 @@ class AIService:
     ) -> Dict[str, Any]:
         """
         Analyze a contact note and extract insights.
+        The sentiment mode is answered by the local lexicon analyzer when AI
+        features are off, or when the provider fails or takes longer than
+        AI_SENTIMENT_TIMEOUT.
         Args:
             note_data: Note data with context
             mode: Analysis mode (insights, sentiment, or action-items)
         Returns:
             Dict[str, Any]: Analysis results
         """
+        if mode == "sentiment":
+            if not self.enabled:
+                return self._local_sentiment(note_data)
+            try:
+                return await asyncio.wait_for(
+                    self._analyze_contact_note(note_data, mode), settings.AI_SENTIMENT_TIMEOUT
+                )
+            except (asyncio.TimeoutError, httpx.HTTPError):
+                return self._local_sentiment(note_data)
+        return await self._analyze_contact_note(note_data, mode)
+
+    def _local_sentiment(self, note_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Sentiment of a note from the local lexicon analyzer."""
+        result = lexicon_analyzer.analyze([note_data["content"]])[0]
+        return {
+            "note_id": note_data["note_id"],
+            "analysis": result["sentiment"],
+            "mode": "sentiment",
+            "sentiment": result["sentiment"],
+            "score": result["score"],
+            "keywords": result["keywords"],
+            "source": "lexicon",
+            "analyzed_at": datetime.utcnow().isoformat()
+        }
+
+    async def _analyze_contact_note(self, note_data: Dict[str, Any], mode: str) -> Dict[str, Any]:
+        """Analyze a contact note with the provider."""
         # Format context for the AI
         context_str = (
             f"Contact: {note_data['context'].get('contact', {}).get('name', 'Unknown')}\n"
@@ -116,12 +378,15 @@ class AIService:
             {"role": "user", "content": f"Analyze this contact note:\n\n{context_str}\n\nProvide analysis focusing on: {mode}"}
         ]
         
-        response = await self._make_request(messages, temperature=0.5)
+        response = await self._make_request(
+            messages, temperature=0.5, operation="analyze_contact_note"
+        )
         
         return {
             "note_id": note_data["note_id"],
             "analysis": response["choices"][0]["message"]["content"],
             "mode": mode,
+            "source": "ai",
             "analyzed_at": datetime.utcnow().isoformat()
         }
 
@@ -152,7 +417,9 @@ class AIService:
             {"role": "user", "content": f"Analyze and prioritize these tasks:\n\n{tasks_str}"}
         ]
         
-        response = await self._make_request(messages, temperature=0.3)
+        response = await self._make_request(
+            messages, temperature=0.3, operation="prioritize_tasks"
+        )
         
         return {
             "analysis": response["choices"][0]["message"]["content"],
@@ -176,6 +443,47 @@ class AIService:
         Returns:
             Dict[str, Any]: Generated email with subject and body
         """
+        response = await self._make_request(
+            self._email_messages(context, template, tone),
+            temperature=0.6,
+            operation="generate_email"
+        )
+        
+        return {
+            "generated_content": response["choices"][0]["message"]["content"],
+            "template": template,
+            "tone": tone,
+            "generated_at": datetime.utcnow().isoformat()
+        }
+
+    def stream_email(
+        self,
+        context: Dict[str, Any],
+        *,
+        template: str = "default",
+        tone: str = "professional"
+    ) -> AsyncIterator[str]:
+        """
+        Generate an email like generate_email, yielding the text as it is written.
+        Args:
+            context: Email context (recipient, purpose, etc.)
+            template: Email template type
+            tone: Desired tone of the email
+        Returns:
+            AsyncIterator[str]: Pieces of the generated email
+        """
+        self._check_enabled()
+        return self._stream_request(
+            self._email_messages(context, template, tone), temperature=0.6
+        )
+
+    def _email_messages(
+        self,
+        context: Dict[str, Any],
+        template: str,
+        tone: str
+    ) -> List[Dict[str, str]]:
+        """Prompt for generating an email."""
         # Format context for the AI
         context_str = (
             f"Recipient: {context.get('recipient_name', 'Unknown')}\n"
@@ -185,22 +493,13 @@ class AIService:
             f"Previous Interaction: {context.get('previous_interaction', 'None')}"
         )
         
-        messages = [
+        return [
             {"role": "system", "content": self._format_system_prompt("emailwriter")},
             {"role": "user", "content": (
                 f"Generate a {tone} email using the {template} template "
                 f"with this context:\n\n{context_str}"
             )}
         ]
-        
-        response = await self._make_request(messages, temperature=0.6)
-        
-        return {
-            "generated_content": response["choices"][0]["message"]["content"],
-            "template": template,
-            "tone": tone,
-            "generated_at": datetime.utcnow().isoformat()
-        }
 
     async def summarize_entity(
         self,
@@ -215,6 +514,40 @@ class AIService:
         Returns:
             Dict[str, Any]: Generated summary
         """
+        response = await self._make_request(
+            self._summary_messages(entity_type, data),
+            temperature=0.4,
+            operation="summarize_entity"
+        )
+        
+        return {
+            "entity_type": entity_type,
+            "entity_id": data.get("id"),
+            "summary": response["choices"][0]["message"]["content"],
+            "generated_at": datetime.utcnow().isoformat()
+        }
+
+    def stream_summary(
+        self,
+        entity_type: str,
+        data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Summarize a contact or deal like summarize_entity, yielding the text
+        as it is written.
+        Args:
+            entity_type: Type of entity (contact/deal)
+            data: Entity data with history
+        Returns:
+            AsyncIterator[str]: Pieces of the summary
+        """
+        self._check_enabled()
+        return self._stream_request(
+            self._summary_messages(entity_type, data), temperature=0.4
+        )
+
+    def _summary_messages(self, entity_type: str, data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Prompt for summarizing a contact or deal."""
         # Format entity data for the AI
         data_str = f"Entity Type: {entity_type}\n"
         if entity_type == "contact":
@@ -236,18 +569,9 @@ class AIService:
                 f"Last Updated: {data.get('updated_at', 'Unknown')}"
             )
         
-        messages = [
+        return [
             {"role": "system", "content": self._format_system_prompt("analyzer")},
             {"role": "user", "content": f"Generate a summary for this {entity_type}:\n\n{data_str}"}
         ]
-        
-        response = await self._make_request(messages, temperature=0.4)
-        
-        return {
-            "entity_type": entity_type,
-            "entity_id": data.get("id"),
-            "summary": response["choices"][0]["message"]["content"],
-            "generated_at": datetime.utcnow().isoformat()
-        }
 
 ai_service = AIService()
\ No newline at end of file
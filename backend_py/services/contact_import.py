@@ -0,0 +1,298 @@
+"""
+Bulk contact import from CSV or JSON uploads.
+
+The upload is parsed record by record, normalized, deduplicated by email
+against the file and the workspace, and inserted in chunks with one
+transaction per chunk. Progress goes to the importing user over the
+WebSocket connection, and rejected records are written to a CSV file the
+user can download until IMPORT_REJECTS_TTL expires.
+"""
+import codecs
+import csv
+import io
+import json
+import os
+import re
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, func
+
+from config import settings
+from app.schemas.websocket import WebSocketMessageType
+from db.database import AsyncSessionLocal
+from db.enums import ContactType
+from db.models import Contact
+from services.crud import contact_service
+from utils.websocket import manager
+
+IMPORT_FIELDS = ("name", "email", "phone", "company", "position", "type")
+REJECT_FIELDS = ("row",) + IMPORT_FIELDS + ("error",)
+
+# Column lengths from db.models.Contact
+MAX_LENGTHS = {"name": 100, "email": 100, "phone": 20, "company": 100, "position": 100}
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+IMPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+READ_SIZE = 64 * 1024
+
+def _iter_csv(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Records of a CSV upload, read lazily (header row gives field names)."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        for record in csv.DictReader(text):
+            yield {(key or "").strip().lower(): value for key, value in record.items()}
+    finally:
+        text.detach()
+
+def _iter_json(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Objects of a JSON array or newline-delimited JSON upload, decoded
+    incrementally so the whole document is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    eof = False
+    while True:
+        # Skip array brackets, separators and whitespace between objects
+        buffer = buffer.lstrip(" \t\r\n[,]")
+        if not buffer:
+            if eof:
+                return
+            chunk = file.read(READ_SIZE)
+            eof = not chunk
+            buffer += reader.decode(chunk, final=eof)
+            continue
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Malformed JSON near: " + buffer[:50])
+            chunk = file.read(READ_SIZE)
+            eof = not chunk
+            buffer += reader.decode(chunk, final=eof)
+            continue
+        buffer = buffer[end:]
+        yield record if isinstance(record, dict) else {"_invalid": record}
+
+def parse_records(file: BinaryIO, format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the records of an upload.
+    Args:
+        file: Binary file object of the upload
+        format: "csv" or "json" (a JSON array or NDJSON)
+    Returns:
+        Iterator[Dict[str, Any]]: Raw records
+    """
+    return _iter_csv(file) if format == "csv" else _iter_json(file)
+
+def normalize_email(email: Any) -> Optional[str]:
+    """Trim and lower-case an email address; None when blank."""
+    if email is None:
+        return None
+    email = str(email).strip().lower()
+    return email or None
+
+def normalize_record(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Validate and normalize one raw record.
+    Returns:
+        Tuple: (contact fields, None) or (None, error message)
+    """
+    if "_invalid" in record:
+        return None, "Record is not an object"
+
+    fields = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        value = str(value).strip() if value is not None else ""
+        fields[field] = value or None
+
+    if not fields["name"]:
+        return None, "Name is required"
+
+    fields["email"] = normalize_email(fields["email"])
+    if fields["email"] and not EMAIL_PATTERN.match(fields["email"]):
+        return None, "Invalid email"
+
+    try:
+        fields["type"] = ContactType(fields["type"].lower()) if fields["type"] else ContactType.LEAD
+    except ValueError:
+        return None, f"Unknown contact type '{fields['type']}'"
+
+    for field, max_length in MAX_LENGTHS.items():
+        if fields[field] and len(fields[field]) > max_length:
+            return None, f"{field} is longer than {max_length} characters"
+
+    return fields, None
+
+def reject_file_path(workspace_id: Any, import_id: str) -> str:
+    """Location of an import's reject file."""
+    if not IMPORT_ID_PATTERN.match(import_id):
+        raise HTTPException(status_code=404, detail="Import not found")
+    return os.path.join(settings.IMPORT_REJECTS_DIR, str(workspace_id), f"{import_id}.csv")
+
+def purge_reject_files(max_age: Optional[int] = None) -> int:
+    """
+    Delete reject files older than max_age.
+    Args:
+        max_age: Seconds to keep a file, defaults to IMPORT_REJECTS_TTL (0 keeps all)
+    Returns:
+        int: Number of files deleted
+    """
+    max_age = settings.IMPORT_REJECTS_TTL if max_age is None else max_age
+    if max_age <= 0 or not os.path.isdir(settings.IMPORT_REJECTS_DIR):
+        return 0
+
+    cutoff = time.time() - max_age
+    deleted = 0
+    with os.scandir(settings.IMPORT_REJECTS_DIR) as workspaces:
+        for workspace in workspaces:
+            if not workspace.is_dir():
+                continue
+            with os.scandir(workspace.path) as files:
+                for entry in files:
+                    if entry.is_file() and entry.name.endswith(".csv") and entry.stat().st_mtime < cutoff:
+                        try:
+                            os.remove(entry.path)
+                            deleted += 1
+                        except FileNotFoundError:
+                            pass
+    return deleted
+
+class ContactImport:
+    """One run of the import pipeline for a workspace."""
+
+    def __init__(self, workspace_id: int, user_id: int, chunk_size: int):
+        self.workspace_id = workspace_id
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.import_id = uuid.uuid4().hex
+        self.seen_emails = set()
+        self.counts = {"processed": 0, "imported": 0, "duplicates": 0, "rejected": 0}
+        self._reject_path = reject_file_path(workspace_id, self.import_id)
+        self._reject_file = None
+        self._reject_writer = None
+
+    def reject(self, row: int, fields: Dict[str, Any], error: str, duplicate: bool = False) -> None:
+        """Append a record to the reject file, creating it on first use."""
+        if self._reject_writer is None:
+            os.makedirs(os.path.dirname(self._reject_path), exist_ok=True)
+            self._reject_file = open(self._reject_path, "w", newline="", encoding="utf-8")
+            self._reject_writer = csv.writer(self._reject_file)
+            self._reject_writer.writerow(REJECT_FIELDS)
+        values = [getattr(fields.get(f), "value", fields.get(f)) for f in IMPORT_FIELDS]
+        self._reject_writer.writerow([row, *values, error])
+        self.counts["duplicates" if duplicate else "rejected"] += 1
+
+    async def run(self, records: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+        """Import all records and return the final counts."""
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            try:
+                for row, record in enumerate(records, start=1):
+                    self.counts["processed"] += 1
+                    fields, error = normalize_record(record)
+                    if error:
+                        self.reject(row, record, error)
+                        continue
+
+                    email = fields["email"]
+                    if email:
+                        if email in self.seen_emails:
+                            self.reject(row, fields, "Duplicate email in file", duplicate=True)
+                            continue
+                        self.seen_emails.add(email)
+
+                    chunk.append((row, fields))
+                    if len(chunk) >= self.chunk_size:
+                        await self._insert_chunk(chunk)
+                        chunk = []
+            except (ValueError, csv.Error) as e:
+                # Unparseable rest of the upload: keep the records read so far
+                self.reject(self.counts["processed"] + 1, {}, str(e))
+
+            if chunk:
+                await self._insert_chunk(chunk)
+        finally:
+            if self._reject_file:
+                self._reject_file.close()
+
+        result = {
+            "import_id": self.import_id,
+            **self.counts,
+            "has_rejects": self._reject_writer is not None,
+        }
+        await self._notify(WebSocketMessageType.IMPORT_COMPLETED, result)
+        return result
+
+    async def _insert_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Drop emails already in the workspace, then insert the chunk in one transaction."""
+        emails = [fields["email"] for _, fields in chunk if fields["email"]]
+
+        async with AsyncSessionLocal() as session:
+            existing = set()
+            if emails:
+                result = await session.execute(
+                    select(func.lower(Contact.email)).where(
+                        Contact.workspace_id == self.workspace_id,
+                        func.lower(Contact.email).in_(emails)
+                    )
+                )
+                existing = set(result.scalars().all())
+
+            rows = []
+            for row, fields in chunk:
+                if fields["email"] in existing:
+                    self.reject(row, fields, "Email already exists in workspace", duplicate=True)
+                    continue
+                rows.append((row, fields))
+
+            if rows:
+                try:
+                    await contact_service.create_many(
+                        session,
+                        objs_in=[
+                            {**fields, "workspace_id": self.workspace_id, "created_by": self.user_id}
+                            for _, fields in rows
+                        ]
+                    )
+                    self.counts["imported"] += len(rows)
+                except HTTPException as e:
+                    for row, fields in rows:
+                        self.reject(row, fields, f"Insert failed: {e.detail}")
+
+        await self._notify(WebSocketMessageType.IMPORT_PROGRESS, dict(self.counts))
+
+    async def _notify(self, message_type: WebSocketMessageType, payload: Dict[str, Any]) -> None:
+        await manager.send_to_user(
+            str(self.workspace_id),
+            str(self.user_id),
+            {"type": message_type.value, "payload": {"import_id": self.import_id, **payload}}
+        )
+
+async def import_contacts(
+    file: BinaryIO,
+    *,
+    format: str,
+    workspace_id: int,
+    user_id: int,
+    chunk_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Import contacts from an upload into a workspace.
+    Args:
+        file: Binary file object of the upload
+        format: "csv" or "json"
+        workspace_id: Target workspace
+        user_id: Importing user (receives progress events, set as created_by)
+        chunk_size: Contacts per insert transaction, defaults to CONTACT_IMPORT_CHUNK_SIZE
+    Returns:
+        Dict[str, Any]: import_id and processed/imported/duplicates/rejected counts
+    """
+    purge_reject_files()
+    run = ContactImport(workspace_id, user_id, chunk_size or settings.CONTACT_IMPORT_CHUNK_SIZE)
+    return await run.run(parse_records(file, format))
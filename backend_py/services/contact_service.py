@@ -1,16 +1,100 @@
 """
-ContactService: Implements getContacts, getContact, createContact, updateContact, deleteContact, addInteraction
+ContactService: Implements getContacts, exportContacts, importContacts, getContact, createContact, updateContact, deleteContact, addInteraction
 """
+import os
 from fastapi import HTTPException, status
+from fastapi.responses import FileResponse
+from db.enums import ContactType
+from services.crud import contact_service
+from services.crud.export import EXPORT_FORMATS, export_rows
+from app.core.responses import export_response
+from services.contact_import import import_contacts, reject_file_path
+
+# Upload file extensions and the import format they imply
+IMPORT_FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "json", ".jsonl": "json"}
 
 class ContactService:
     @staticmethod
-    async def get_contacts(user, type=None, search=None):
+    async def get_contacts(user, db, type=None, search=None, limit=100, offset=0):
         """
-        Get all contacts for workspace.
-        TODO: Implement DB logic using SQLAlchemy async.
+        Get all contacts for workspace, newest first or ranked by search.
+        Returns list columns only, as plain rows.
+        """
+        rows = await contact_service.get_contact_rows(
+            db,
+            user.workspace_id,
+            contact_type=ContactService._contact_type(type),
+            search_term=search,
+            limit=limit,
+            offset=offset
+        )
+        return {"success": True, "data": rows}
+
+    @staticmethod
+    def export_contacts(user, db, format="csv", compress=False, type=None, search=None):
+        """
+        Stream all matching contacts as a CSV or NDJSON download.
+        Takes the same filters as get_contacts.
+        """
+        query = contact_service.contact_rows_query(
+            db,
+            user.workspace_id,
+            contact_type=ContactService._contact_type(type),
+            search_term=search
+        )
+        return export_response(
+            export_rows(query, format=format, compress=compress),
+            media_type=EXPORT_FORMATS[format],
+            filename=f"contacts.{format}",
+            compressed=compress
+        )
+
+    @staticmethod
+    async def import_contacts(user, upload, format=None):
         """
-        return {"success": True, "data": []}
+        Import contacts from a CSV or JSON upload.
+        Progress is pushed to the user over the WebSocket; rejected rows
+        can be downloaded afterwards with get_import_rejects.
+        """
+        format = format or IMPORT_FORMATS.get(os.path.splitext(upload.filename or "")[1].lower())
+        if not format:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot tell the upload format; pass format=csv or format=json"
+            )
+
+        result = await import_contacts(
+            upload.file,
+            format=format,
+            workspace_id=user.workspace_id,
+            user_id=user.id
+        )
+        return {
+            "success": True,
+            "data": result,
+            "reject_file": (
+                f"/api/contacts/import/{result['import_id']}/rejects"
+                if result["has_rejects"] else None
+            )
+        }
+
+    @staticmethod
+    def get_import_rejects(user, import_id):
+        """
+        Download the rejected rows of an import as CSV.
+        """
+        path = reject_file_path(user.workspace_id, import_id)
+        if not os.path.exists(path):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+        return FileResponse(path, media_type="text/csv", filename=f"contact-import-{import_id}-rejects.csv")
+
+    @staticmethod
+    def _contact_type(type):
+        """Parse the contact type filter."""
+        try:
+            return ContactType(type) if type else None
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     @staticmethod
     async def get_contact(id, user):
@@ -1,4 +1,5 @@
 from .base import CRUDBase
+from .ai_job import ai_job_service
 from .contact import contact_service
 from .deal import deal_service
 from .note import note_service
@@ -7,6 +8,7 @@ from .user import user_service
 
 __all__ = [
     "CRUDBase",
+    "ai_job_service",
     "contact_service",
     "deal_service",
     "note_service",
@@ -0,0 +1,133 @@
+"""
+AI job service with the state transitions of background AI operations.
+"""
+from typing import Optional, List
+from sqlalchemy import select, update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from db.database import primary_only
+from db.models import AIJob
+from .base import CRUDBase
+
+# Job states, in order
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+class AIJobService(CRUDBase[AIJob]):
+    def __init__(self):
+        super().__init__(AIJob)
+
+    # Job state changes right after it is written, and a lagging replica
+    # would miss new jobs (404 while polling, not re-queued at startup)
+    @primary_only
+    async def get_job(
+        self,
+        db: AsyncSession,
+        job_id: str,
+        workspace_id: int
+    ) -> Optional[AIJob]:
+        """
+        Get a job of a workspace.
+        Args:
+            db: AsyncSession
+            job_id: Job ID
+            workspace_id: Workspace ID for security check
+        Returns:
+            Optional[AIJob]: Found job or None
+        """
+        query = select(AIJob).where(
+            and_(
+                AIJob.id == job_id,
+                AIJob.workspace_id == workspace_id
+            )
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @primary_only
+    async def get_queued_ids(self, db: AsyncSession) -> List[str]:
+        """
+        Get IDs of jobs still waiting to run, oldest first.
+        Args:
+            db: AsyncSession
+        Returns:
+            List[str]: Job IDs
+        """
+        query = (
+            select(AIJob.id)
+            .where(AIJob.status == JOB_QUEUED)
+            .order_by(AIJob.created_at)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def claim(self, db: AsyncSession, job_id: str) -> Optional[AIJob]:
+        """
+        Move a queued job to running. Only one worker (of any process)
+        can claim a job.
+        Args:
+            db: AsyncSession
+            job_id: Job ID
+        Returns:
+            Optional[AIJob]: The claimed job, or None if it was not queued
+        """
+        result = await db.execute(
+            update(AIJob)
+            .where(AIJob.id == job_id, AIJob.status == JOB_QUEUED)
+            .values(status=JOB_RUNNING, started_at=datetime.utcnow())
+        )
+        await self._commit(db)
+        if result.rowcount == 0:
+            return None
+        return await self.get(db, job_id)
+
+    async def finish(
+        self,
+        db: AsyncSession,
+        job_id: str,
+        *,
+        result: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Record the outcome of a running job.
+        Args:
+            db: AsyncSession
+            job_id: Job ID
+            result: JSON-encoded result on success
+            error: Error message on failure
+        """
+        await db.execute(
+            update(AIJob)
+            .where(AIJob.id == job_id)
+            .values(
+                status=JOB_FAILED if error is not None else JOB_COMPLETED,
+                result=result,
+                error=error,
+                finished_at=datetime.utcnow()
+            )
+        )
+        await self._commit(db)
+
+    async def fail_stale(self, db: AsyncSession, started_before: datetime) -> int:
+        """
+        Fail running jobs whose worker went away (e.g. a restart), so they
+        do not stay running forever.
+        Args:
+            db: AsyncSession
+            started_before: Running jobs started before this are stale
+        Returns:
+            int: Number of jobs marked failed
+        """
+        result = await db.execute(
+            update(AIJob)
+            .where(AIJob.status == JOB_RUNNING, AIJob.started_at < started_before)
+            .values(status=JOB_FAILED, error="Interrupted", finished_at=datetime.utcnow())
+        )
+        await self._commit(db)
+        return result.rowcount
+
+ai_job_service = AIJobService()
@@ -1,15 +1,123 @@
 """
 Base CRUD service class for database operations.
 """
-from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
-from sqlalchemy import select, update, delete
+import inspect
+from typing import TypeVar, Generic, Type, Optional, List, Dict, Any, Iterator, Sequence, Tuple
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_parent
+from sqlalchemy.sql import Select
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
-from db.database import Base
+from db.database import Base, route_session
+from .cache import mark_workspaces_dirty
+from .counters import COUNTED_MODELS, counted_rows, apply_row_changes
+from .projection import fetch_rows
+from .pagination import encode_cursor, decode_cursor, keyset_condition, keyset_order
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Service methods named like this may be served from a read replica
+READ_ONLY_METHODS = ("get",)
+READ_ONLY_PREFIXES = ("get_", "search_")
+
+# Rows per multi-row statement in the bulk methods
+BULK_CHUNK_SIZE = 500
+
+# Default number of rows loaded per sub-collection on detail views
+RELATED_PAGE_SIZE = 20
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split rows into lists of at most `size` items."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def upsert_rows(
+    db: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    *,
+    index_elements: List[str],
+    update_fields: Optional[List[str]] = None,
+    chunk_size: int = BULK_CHUNK_SIZE
+) -> List[int]:
+    """
+    Execute INSERT ... ON CONFLICT DO UPDATE for many rows without committing.
+    Args:
+        db: AsyncSession
+        model: Mapped class to insert into
+        rows: List of field/value dictionaries
+        index_elements: Columns of the unique index that defines a conflict
+        update_fields: Columns to overwrite on conflict; defaults to every
+            supplied field except the index columns and id
+        chunk_size: Rows per INSERT statement
+    Returns:
+        List[int]: IDs of the inserted or updated rows, in input order
+    Raises:
+        ValueError: If the database dialect has no ON CONFLICT support
+    """
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    dialect_insert = UPSERT_INSERTS.get(dialect)
+    if dialect_insert is None:
+        raise ValueError(f"Upsert is not supported on {dialect}")
+
+    if update_fields is None:
+        update_fields = [
+            field for field in rows[0]
+            if field not in index_elements and field != "id"
+        ]
+
+    stmt = dialect_insert(model)
+    # Conflicting rows must still be touched so RETURNING reports their id
+    set_ = {field: stmt.excluded[field] for field in update_fields or index_elements[:1]}
+    if "updated_at" in model.__table__.c and "updated_at" not in set_:
+        set_["updated_at"] = func.now()
+    # Ordered RETURNING would make SQLAlchemy send upserts one row at a
+    # time; the conflict key maps the returned ids back to input rows instead
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_=set_
+    ).returning(model.id, *(getattr(model, field) for field in index_elements))
+
+    ids: List[int] = []
+    for chunk in _chunks(rows, chunk_size):
+        result = await db.execute(stmt, chunk)
+        ids_by_key = {tuple(key): id_ for id_, *key in result.all()}
+        ids.extend(ids_by_key[tuple(row[field] for field in index_elements)] for row in chunk)
+    return ids
+
+def _route_methods(cls) -> None:
+    """Wrap a service class's public coroutine methods with route_session."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            continue
+        if getattr(attr, "__routed__", False):
+            continue
+        is_read = name in READ_ONLY_METHODS or name.startswith(READ_ONLY_PREFIXES)
+        setattr(cls, name, route_session(is_read)(attr))
+
 class CRUDBase(Generic[ModelType]):
+    # Sub-collections loaded by get_with_relations / get_related_page,
+    # mapped to the column they are ordered by (newest first)
+    RELATED_COLLECTIONS: Dict[str, str] = {}
+
+    # Columns list views select by default (see select_columns)
+    LIST_COLUMNS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _route_methods(cls)
+
     def __init__(self, model: Type[ModelType]):
         """
         Initialize service with SQLAlchemy model.
@@ -41,6 +149,8 @@ class CRUDBase(Generic[ModelType]):
     ) -> List[ModelType]:
         """
         Get multiple records with optional filtering.
+        Offset paging gets slower the deeper the page; prefer get_page for
+        scrolling through large workspaces.
         Args:
             db: AsyncSession
             skip: Number of records to skip
@@ -49,16 +159,298 @@ class CRUDBase(Generic[ModelType]):
         Returns:
             List[ModelType]: List of found records
         """
-        query = select(self.model)
-        
+        query = self._apply_filters(select(self.model), filters)
+        query = query.offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    def select_columns(self, columns: Optional[Sequence[str]] = None) -> Select:
+        """
+        Build a select of only the named columns, for list views.
+        Args:
+            columns: Column names, defaults to LIST_COLUMNS (all columns if unset)
+        Returns:
+            Select: Column select to run with fetch_rows
+        """
+        table_columns = self.model.__table__.c
+        names = columns or self.LIST_COLUMNS or table_columns.keys()
+        unknown = [name for name in names if name not in table_columns]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown columns: {', '.join(unknown)}"
+            )
+        return select(*(getattr(self.model, name) for name in names))
+
+    async def get_rows(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get multiple records as JSON-ready dicts of selected columns.
+        Cheaper than get_multi for list views: no ORM entities are built.
+        Args:
+            db: AsyncSession
+            columns: Column names, defaults to LIST_COLUMNS
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            order_by: Column to sort by
+            descending: Sort direction
+            filters: Optional dictionary of filter conditions
+        Returns:
+            List[Dict[str, Any]]: One dict per record
+        """
+        query = self.list_query(
+            columns=columns, order_by=order_by, descending=descending, filters=filters
+        )
+        return await fetch_rows(db, query.offset(skip).limit(limit))
+
+    def list_query(
+        self,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: Dict[str, Any] = None
+    ) -> Select:
+        """
+        Build the filtered, sorted column select behind get_rows, for callers
+        that page or stream it themselves.
+        Args:
+            columns: Column names, defaults to LIST_COLUMNS
+            order_by: Column to sort by
+            descending: Sort direction
+            filters: Optional dictionary of filter conditions
+        Returns:
+            Select: Column select
+        """
+        if order_by not in self.model.__table__.c:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{order_by}'"
+            )
+        column = getattr(self.model, order_by)
+        query = self._apply_filters(self.select_columns(columns), filters)
+        return query.order_by(*keyset_order(column, self.model.id, descending))
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a page of records using keyset (cursor) pagination.
+        Rows are ordered by (order_by, id), so the cost of a page does not
+        grow with how deep the client has scrolled.
+        Args:
+            db: AsyncSession
+            cursor: Opaque cursor from a previous page's next_cursor
+            limit: Maximum number of records to return
+            order_by: Column to sort by
+            descending: Sort direction
+            filters: Optional dictionary of filter conditions
+        Returns:
+            Dict[str, Any]: items, next_cursor and has_more
+        """
+        if order_by not in self.model.__table__.c:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{order_by}'"
+            )
+        query = self._apply_filters(select(self.model), filters)
+        return await self._keyset_page(
+            db, query, self.model, order_by,
+            cursor=cursor, limit=limit, descending=descending
+        )
+
+    async def get_related_page(
+        self,
+        db: AsyncSession,
+        id: int,
+        workspace_id: int,
+        relation: str,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = RELATED_PAGE_SIZE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a page of one of a record's sub-collections, newest first.
+        Continues from the cursors set by get_with_relations.
+        Args:
+            db: AsyncSession
+            id: Parent record ID
+            workspace_id: Workspace ID for security check
+            relation: Name of a relation in RELATED_COLLECTIONS
+            cursor: Opaque cursor from a previous page's next_cursor
+            limit: Maximum number of related records to return
+        Returns:
+            Optional[Dict[str, Any]]: items, next_cursor and has_more, or
+                None if the parent record was not found
+        """
+        if relation not in self.RELATED_COLLECTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot page through '{relation}'"
+            )
+
+        result = await db.execute(
+            select(self.model).where(
+                self.model.id == id,
+                self.model.workspace_id == workspace_id
+            )
+        )
+        parent = result.scalar_one_or_none()
+        if not parent:
+            return None
+        return await self._related_page(db, parent, relation, cursor=cursor, limit=limit)
+
+    async def _load_related(
+        self,
+        db: AsyncSession,
+        parent: ModelType,
+        limits: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Load the newest rows of each RELATED_COLLECTIONS relation onto
+        `parent`, one bounded SELECT per relation, and record where each
+        collection continues in `parent.related_cursors`.
+        """
+        limits = limits or {}
+        parent.related_cursors = {}
+        for relation in self.RELATED_COLLECTIONS:
+            page = await self._related_page(
+                db, parent, relation, limit=limits.get(relation, RELATED_PAGE_SIZE)
+            )
+            # Populate without marking the collection as modified
+            set_committed_value(parent, relation, page["items"])
+            parent.related_cursors[relation] = page["next_cursor"]
+
+    async def _related_page(
+        self,
+        db: AsyncSession,
+        parent: ModelType,
+        relation: str,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = RELATED_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """Keyset page of a parent's sub-collection, newest first."""
+        attribute = getattr(self.model, relation)
+        target = attribute.property.mapper.class_
+        query = select(target).where(with_parent(parent, attribute))
+        return await self._keyset_page(
+            db, query, target, self.RELATED_COLLECTIONS[relation],
+            cursor=cursor, limit=limit, descending=True
+        )
+
+    async def _keyset_page(
+        self,
+        db: AsyncSession,
+        query,
+        model,
+        order_by: str,
+        *,
+        cursor: Optional[str],
+        limit: int,
+        descending: bool
+    ) -> Dict[str, Any]:
+        """Run a select of `model` as one keyset page ordered by (order_by, id)."""
+        column = getattr(model, order_by)
+
+        if cursor:
+            try:
+                value, last_id = decode_cursor(cursor, order_by, descending, column)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            query = query.where(
+                keyset_condition(column, model.id, value, last_id, descending)
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        query = query.order_by(*keyset_order(column, model.id, descending)).limit(limit + 1)
+        result = await db.execute(query)
+        items = list(result.scalars().all())
+
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(order_by, descending, getattr(last, order_by), last.id)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+
+    async def _commit(self, db: AsyncSession) -> None:
+        """
+        Make pending changes durable. Inside a request unit of work this
+        only flushes; the request commits once before its response is sent.
+        """
+        if db.info.get("unit_of_work"):
+            await db.flush()
+        else:
+            await db.commit()
+
+    def _workspace_scoped(self) -> bool:
+        """Whether the model belongs to a workspace (and may be cached per workspace)."""
+        return "workspace_id" in self.model.__table__.c
+
+    def _mark_dirty_rows(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Invalidate cached results for the workspaces of written rows."""
+        if self._workspace_scoped():
+            mark_workspaces_dirty(db, {row.get("workspace_id") for row in rows})
+
+    async def _counter_snapshot(
+        self,
+        db: AsyncSession,
+        values: Sequence[Any] = (),
+        keys: Sequence[str] = ("id",)
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Counted columns of rows a Core write is about to change, for
+        _update_counters; None if the model has no dashboard counters.
+        """
+        if self.model not in COUNTED_MODELS:
+            return None
+        return await counted_rows(db, self.model, values, keys) if values else []
+
+    async def _update_counters(
+        self,
+        db: AsyncSession,
+        before: Optional[List[Dict[str, Any]]],
+        ids: Sequence[int] = ()
+    ) -> None:
+        """Apply the counter changes of a Core write to rows `ids` (ORM flushes count themselves)."""
+        if before is None:
+            return
+        after = await counted_rows(db, self.model, ids) if ids else []
+        await apply_row_changes(db, self.model, before, after)
+
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """Apply equality filters for fields that exist on the model."""
         if filters:
             for field, value in filters.items():
                 if hasattr(self.model, field):
                     query = query.where(getattr(self.model, field) == value)
-        
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
+        return query
 
     async def create(self, db: AsyncSession, *, obj_in: Dict[str, Any]) -> ModelType:
         """
@@ -72,7 +464,7 @@ class CRUDBase(Generic[ModelType]):
         try:
             db_obj = self.model(**obj_in)
             db.add(db_obj)
-            await db.commit()
+            await self._commit(db)
             await db.refresh(db_obj)
             return db_obj
         except Exception as e:
@@ -99,9 +491,15 @@ class CRUDBase(Generic[ModelType]):
             Optional[ModelType]: Updated record or None
         """
         try:
+            before = await self._counter_snapshot(db, [id])
             query = update(self.model).where(self.model.id == id).values(**obj_in)
-            await db.execute(query)
-            await db.commit()
+            if self._workspace_scoped():
+                query = query.returning(self.model.workspace_id)
+            result = await db.execute(query)
+            if self._workspace_scoped():
+                mark_workspaces_dirty(db, result.scalars().all())
+            await self._update_counters(db, before, [id])
+            await self._commit(db)
             
             # Fetch updated record
             return await self.get(db, id)
@@ -112,6 +510,146 @@ class CRUDBase(Generic[ModelType]):
                 detail=str(e)
             )
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Create many records with multi-row INSERTs in one transaction.
+        Args:
+            db: AsyncSession
+            objs_in: List of field/value dictionaries
+            chunk_size: Rows per INSERT statement
+        Returns:
+            List[int]: IDs of the created records, in input order
+        """
+        # SQLite can only guarantee RETURNING order by executing row by row.
+        # Its generated ids increase in insert order within one statement
+        # (single writer), so sorting them restores input order instead.
+        ordered = (
+            db.get_bind().dialect.name != "sqlite"
+            or any("id" in obj for obj in objs_in)
+        )
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=ordered)
+
+        ids: List[int] = []
+        try:
+            before = await self._counter_snapshot(db)
+            for chunk in _chunks(objs_in, chunk_size):
+                result = await db.execute(stmt, chunk)
+                chunk_ids = result.scalars().all()
+                ids.extend(chunk_ids if ordered else sorted(chunk_ids))
+            self._mark_dirty_rows(db, objs_in)
+            await self._update_counters(db, before, ids)
+            await self._commit(db)
+            return ids
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Update many records by primary key in one transaction.
+        If any ID does not exist the whole batch is rolled back.
+        Args:
+            db: AsyncSession
+            objs_in: List of dictionaries, each with "id" and the fields to set
+            chunk_size: Rows per UPDATE batch
+        Returns:
+            List[int]: IDs of the updated records
+        """
+        if any("id" not in obj for obj in objs_in):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Every record passed to update_many needs an id"
+            )
+
+        ids = [obj["id"] for obj in objs_in]
+        try:
+            before = await self._counter_snapshot(db, ids)
+            for chunk in _chunks(objs_in, chunk_size):
+                await db.execute(update(self.model), chunk)
+            if self._workspace_scoped():
+                result = await db.execute(
+                    select(self.model.workspace_id).where(self.model.id.in_(ids)).distinct()
+                )
+                mark_workspaces_dirty(db, result.scalars().all())
+            await self._update_counters(db, before, ids)
+            await self._commit(db)
+            return ids
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[Dict[str, Any]],
+        index_elements: List[str],
+        update_fields: Optional[List[str]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Insert many records, updating rows that conflict on a unique index,
+        using INSERT ... ON CONFLICT DO UPDATE in one transaction.
+        Args:
+            db: AsyncSession
+            objs_in: List of field/value dictionaries
+            index_elements: Columns of the unique index that defines a conflict
+            update_fields: Columns to overwrite on conflict; defaults to every
+                supplied field except the index columns and id
+            chunk_size: Rows per INSERT statement
+        Returns:
+            List[int]: IDs of the inserted or updated records, in input order
+        """
+        if not objs_in:
+            return []
+
+        try:
+            before = await self._counter_snapshot(
+                db,
+                [
+                    obj[index_elements[0]] if len(index_elements) == 1
+                    else tuple(obj[field] for field in index_elements)
+                    for obj in objs_in
+                ],
+                keys=index_elements
+            )
+            ids = await upsert_rows(
+                db,
+                self.model,
+                objs_in,
+                index_elements=index_elements,
+                update_fields=update_fields,
+                chunk_size=chunk_size
+            )
+            self._mark_dirty_rows(db, objs_in)
+            await self._update_counters(db, before, ids)
+            await self._commit(db)
+            return ids
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
     async def delete(self, db: AsyncSession, *, id: int) -> bool:
         """
         Delete a record by ID.
@@ -123,12 +661,23 @@ class CRUDBase(Generic[ModelType]):
         """
         try:
             query = delete(self.model).where(self.model.id == id)
-            result = await db.execute(query)
-            await db.commit()
-            return result.rowcount > 0
+            if not self._workspace_scoped():
+                result = await db.execute(query)
+                await self._commit(db)
+                return result.rowcount > 0
+
+            before = await self._counter_snapshot(db, [id])
+            result = await db.execute(query.returning(self.model.workspace_id))
+            workspace_ids = result.scalars().all()
+            mark_workspaces_dirty(db, workspace_ids)
+            await self._update_counters(db, before)
+            await self._commit(db)
+            return len(workspace_ids) > 0
         except Exception as e:
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
-            )
\ No newline at end of file
+            )
+
+_route_methods(CRUDBase)
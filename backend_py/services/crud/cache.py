@@ -0,0 +1,226 @@
+"""
+Result cache for read-heavy service methods.
+
+Entries are keyed by (service method, workspace, workspace version, args).
+Writes bump the workspace version once their transaction commits, so stale
+entries are never served again and age out through TTL/LRU eviction.
+"""
+import functools
+import inspect
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy import inspect as inspect_state
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.state import InstanceState
+
+from config import settings
+from app.core.metrics import QUERY_CACHE_REQUESTS
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Rough deep size of a cached value in bytes."""
+    _seen = _seen if _seen is not None else set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        # ORM instances: count loaded attributes, not SQLAlchemy state
+        size += sum(
+            estimate_size(v, _seen)
+            for k, v in vars(value).items()
+            if not k.startswith("_sa_")
+        )
+    return size
+
+class QueryCache:
+    """In-process TTL + LRU cache with an approximate memory cap."""
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._versions: Dict[Any, int] = {}
+        self._bytes = 0
+        self._lock = Lock()
+
+    def version(self, workspace_id: Any) -> int:
+        """Current data version of a workspace."""
+        return self._versions.get(workspace_id, 0)
+
+    def bump(self, workspace_ids: Iterable[Any]) -> None:
+        """Invalidate every cached result for the given workspaces."""
+        with self._lock:
+            for workspace_id in workspace_ids:
+                self._versions[workspace_id] = self._versions.get(workspace_id, 0) + 1
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a key. Returns (hit, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at, size = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries as needed."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + (ttl or self.default_ttl)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop all entries and versions."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Current entry count and estimated size."""
+        return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+query_cache = QueryCache(
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    max_bytes=settings.QUERY_CACHE_MAX_BYTES,
+    default_ttl=settings.QUERY_CACHE_TTL
+)
+
+def mark_workspaces_dirty(db: AsyncSession, workspace_ids: Iterable[Any]) -> None:
+    """Queue workspace invalidations to apply when the session commits."""
+    pending = db.info.setdefault("dirty_workspaces", set())
+    pending.update(w for w in workspace_ids if w is not None)
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_workspaces(session, flush_context):
+    pending = session.info.setdefault("dirty_workspaces", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        workspace_id = getattr(obj, "workspace_id", None)
+        if workspace_id is not None:
+            pending.add(workspace_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_workspaces(session):
+    pending = session.info.pop("dirty_workspaces", None)
+    if pending:
+        query_cache.bump(pending)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_workspaces(session):
+    session.info.pop("dirty_workspaces", None)
+
+def detached_copy(value: Any, _memo: Optional[Dict[int, Any]] = None) -> Any:
+    """
+    Copy of a result in which ORM instances are replaced by session-less
+    copies holding their loaded attributes (loaded relationships are
+    copied too). Expiring or rolling back the originals' session does not
+    affect the copies; attributes that were not loaded stay unavailable.
+    """
+    _memo = _memo if _memo is not None else {}
+    if isinstance(value, list):
+        return [detached_copy(item, _memo) for item in value]
+    if type(value) is tuple:
+        return tuple(detached_copy(item, _memo) for item in value)
+    if isinstance(value, dict):
+        return {key: detached_copy(item, _memo) for key, item in value.items()}
+
+    state = inspect_state(value, raiseerr=False)
+    if not isinstance(state, InstanceState):
+        return value
+    if id(value) in _memo:
+        return _memo[id(value)]
+
+    copy = state.manager.new_instance()
+    _memo[id(value)] = copy
+    for key, loaded in list(state.dict.items()):
+        if key in state.manager:
+            set_committed_value(copy, key, detached_copy(loaded, _memo))
+    if state.key is not None:
+        make_transient_to_detached(copy)
+    return copy
+
+def cached(ttl: Optional[int] = None):
+    """
+    Cache a workspace-scoped service method's result.
+    The method must take `db` and `workspace_id` arguments. ORM objects
+    are cached as detached copies (detached_copy), never the caller's
+    session-bound instances, and shared between requests: treat them as
+    read-only. Sessions that have already written bypass the cache so
+    they read their own writes. Misses are always read from the primary,
+    even inside read-only methods: a lagging replica's result would be
+    stored under the current version and served until it expires.
+    Args:
+        ttl: Seconds to keep a result, defaults to QUERY_CACHE_TTL
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        method_name = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self", None)
+            db = arguments.pop("db")
+            workspace_id = arguments.pop("workspace_id")
+
+            if not settings.QUERY_CACHE_ENABLED or db.info.get("sticky_primary"):
+                return await func(*args, **kwargs)
+
+            key = (
+                method_name,
+                workspace_id,
+                query_cache.version(workspace_id),
+                tuple(sorted((name, repr(value)) for name, value in arguments.items()))
+            )
+            hit, value = query_cache.get(key)
+            QUERY_CACHE_REQUESTS.labels(method=method_name, result="hit" if hit else "miss").inc()
+            if hit:
+                return value
+
+            # Fill from the primary only (see RoutingSession)
+            route_read_only = db.info.get("route_read_only")
+            db.info["route_read_only"] = False
+            try:
+                value = await func(*args, **kwargs)
+            finally:
+                if route_read_only is None:
+                    db.info.pop("route_read_only", None)
+                else:
+                    db.info["route_read_only"] = route_read_only
+            query_cache.set(key, detached_copy(value), ttl)
+            return value
+
+        return wrapper
+    return decorator
@@ -1,15 +1,38 @@
 """
 Contact service with specialized contact-related database operations.
 """
-from typing import Optional, Dict, Any, List
-from sqlalchemy import select, and_
+from typing import Optional, Dict, Any, List, Set, Tuple
+from sqlalchemy import select, and_, insert, delete, tuple_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
+from fastapi import HTTPException, status
 
-from db.models import Contact, Tag, Interaction, Note
-from .base import CRUDBase
+from db.models import Contact, Tag, Interaction, Note, contact_tags
+from db.enums import ContactType
+from .base import CRUDBase, BULK_CHUNK_SIZE, UPSERT_INSERTS, upsert_rows, _chunks
+from .cache import mark_workspaces_dirty
+from .projection import fetch_rows
+from .search import search_tokens, use_full_text, apply_full_text_search
+
+def normalize_tag_names(tags: List[str]) -> List[str]:
+    """Strip tag names and drop blanks and duplicates, keeping input order."""
+    names = (tag.strip() for tag in tags if tag)
+    return list(dict.fromkeys(name for name in names if name))
 
 class ContactService(CRUDBase[Contact]):
+    LIST_COLUMNS = (
+        "id", "name", "email", "phone", "company", "position", "type",
+        "created_at", "updated_at",
+    )
+
+    RELATED_COLLECTIONS = {
+        "tags": "created_at",
+        "interactions": "interaction_date",
+        "notes": "created_at",
+        "tasks": "created_at",
+        "deals": "created_at",
+    }
+
     def __init__(self):
         super().__init__(Contact)
 
@@ -17,35 +40,35 @@ class ContactService(CRUDBase[Contact]):
         self,
         db: AsyncSession,
         contact_id: int,
-        workspace_id: int
+        workspace_id: int,
+        *,
+        limits: Optional[Dict[str, int]] = None
     ) -> Optional[Contact]:
         """
-        Get contact with all related data.
+        Get contact with the newest rows of each related collection.
+        Each collection is loaded with its own bounded query, so the cost
+        does not grow with the contact's history. Cursors for the rest of
+        each collection are in `contact.related_cursors`; pass them to
+        get_related_page.
         Args:
             db: AsyncSession
             contact_id: Contact ID
             workspace_id: Workspace ID for security check
+            limits: Rows to load per relation, defaults to RELATED_PAGE_SIZE
         Returns:
             Optional[Contact]: Found contact with relations or None
         """
-        query = (
-            select(Contact)
-            .options(
-                joinedload(Contact.tags),
-                joinedload(Contact.interactions),
-                joinedload(Contact.notes),
-                joinedload(Contact.tasks),
-                joinedload(Contact.deals)
-            )
-            .where(
-                and_(
-                    Contact.id == contact_id,
-                    Contact.workspace_id == workspace_id
-                )
+        query = select(Contact).where(
+            and_(
+                Contact.id == contact_id,
+                Contact.workspace_id == workspace_id
             )
         )
         result = await db.execute(query)
-        return result.unique().scalar_one_or_none()
+        contact = result.scalar_one_or_none()
+        if contact:
+            await self._load_related(db, contact, limits)
+        return contact
 
     async def get_contacts_by_type(
         self,
@@ -75,7 +98,11 @@ class ContactService(CRUDBase[Contact]):
         self,
         db: AsyncSession,
         workspace_id: int,
-        search_term: str
+        search_term: str,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        full_text: Optional[bool] = None
     ) -> List[Contact]:
         """
         Search contacts by name, email, or company.
@@ -83,23 +110,93 @@ class ContactService(CRUDBase[Contact]):
             db: AsyncSession
             workspace_id: Workspace ID
             search_term: Term to search for
+            limit: Maximum number of contacts to return
+            offset: Number of ranked results to skip
+            full_text: Use the full-text index (ranked by relevance) instead
+                of ILIKE; defaults to settings.SEARCH_BACKEND
         Returns:
             List[Contact]: List of matching contacts
         """
-        search = f"%{search_term}%"
-        query = select(Contact).where(
-            and_(
-                Contact.workspace_id == workspace_id,
-                (
-                    Contact.name.ilike(search) |
-                    Contact.email.ilike(search) |
-                    Contact.company.ilike(search)
-                )
-            )
-        )
-        result = await db.execute(query)
+        query = select(Contact).where(Contact.workspace_id == workspace_id)
+        query = self._apply_search(db, query, search_term, full_text)
+        result = await db.execute(query.offset(offset).limit(limit))
         return result.scalars().all()
 
+    async def get_contact_rows(
+        self,
+        db: AsyncSession,
+        workspace_id: int,
+        *,
+        contact_type: Optional[ContactType] = None,
+        search_term: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        full_text: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List contacts as JSON-ready dicts of LIST_COLUMNS.
+        Args:
+            db: AsyncSession
+            workspace_id: Workspace ID
+            contact_type: Only contacts of this type
+            search_term: Only contacts matching this term, ranked as in
+                search_contacts; otherwise newest first
+            columns: Column names, defaults to LIST_COLUMNS
+            limit: Maximum number of contacts to return
+            offset: Number of contacts to skip
+            full_text: See search_contacts
+        Returns:
+            List[Dict[str, Any]]: One dict per contact
+        """
+        query = self.contact_rows_query(
+            db,
+            workspace_id,
+            contact_type=contact_type,
+            search_term=search_term,
+            columns=columns,
+            full_text=full_text
+        )
+        return await fetch_rows(db, query.offset(offset).limit(limit))
+
+    def contact_rows_query(
+        self,
+        db: AsyncSession,
+        workspace_id: int,
+        *,
+        contact_type: Optional[ContactType] = None,
+        search_term: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        full_text: Optional[bool] = None
+    ) -> Select:
+        """Build the column select behind get_contact_rows, unpaged."""
+        query = self.select_columns(columns).where(Contact.workspace_id == workspace_id)
+        if contact_type:
+            query = query.where(Contact.type == contact_type)
+        if search_term:
+            return self._apply_search(db, query, search_term, full_text)
+        return query.order_by(desc(Contact.created_at), desc(Contact.id))
+
+    def _apply_search(
+        self,
+        db: AsyncSession,
+        query: Select,
+        search_term: str,
+        full_text: Optional[bool]
+    ) -> Select:
+        """Filter and order a contact select by a search term."""
+        tokens = search_tokens(search_term)
+        dialect = db.get_bind().dialect.name
+        if use_full_text(full_text, dialect) and tokens:
+            return apply_full_text_search(query, Contact, dialect, tokens)
+
+        search = f"%{search_term}%"
+        return query.where(
+            Contact.name.ilike(search) |
+            Contact.email.ilike(search) |
+            Contact.company.ilike(search)
+        ).order_by(Contact.name, Contact.id)
+
     async def add_interaction(
         self,
         db: AsyncSession,
@@ -118,7 +215,7 @@ class ContactService(CRUDBase[Contact]):
         """
         interaction = Interaction(contact_id=contact_id, **interaction_data)
         db.add(interaction)
-        await db.commit()
+        await self._commit(db)
         await db.refresh(interaction)
         return interaction
 
@@ -140,7 +237,7 @@ class ContactService(CRUDBase[Contact]):
         """
         note = Note(contact_id=contact_id, **note_data)
         db.add(note)
-        await db.commit()
+        await self._commit(db)
         await db.refresh(note)
         return note
 
@@ -152,7 +249,7 @@ class ContactService(CRUDBase[Contact]):
         tags: List[str]
     ) -> Contact:
         """
-        Update contact tags.
+        Replace a contact's tags, creating tags that don't exist yet.
         Args:
             db: AsyncSession
             contact_id: Contact ID
@@ -164,22 +261,149 @@ class ContactService(CRUDBase[Contact]):
         if not contact:
             return None
 
-        # Clear existing tags
-        contact.tags = []
-
-        # Add new tags
-        for tag_name in tags:
-            tag = await db.execute(
-                select(Tag).where(Tag.name == tag_name)
+        try:
+            tag_ids = await self._resolve_tags(db, contact.workspace_id, normalize_tag_names(tags))
+            await self._sync_contact_tags(db, [contact.id], set(tag_ids.values()), replace=True)
+            mark_workspaces_dirty(db, [contact.workspace_id])
+            await self._commit(db)
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
             )
-            tag = tag.scalar_one_or_none()
-            if not tag:
-                tag = Tag(name=tag_name, workspace_id=contact.workspace_id)
-                db.add(tag)
-            contact.tags.append(tag)
-
-        await db.commit()
-        await db.refresh(contact)
+
+        await db.refresh(contact, attribute_names=["tags"])
         return contact
 
+    async def tag_contacts(
+        self,
+        db: AsyncSession,
+        *,
+        workspace_id: int,
+        contact_ids: List[int],
+        tags: List[str],
+        replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        Tag many contacts at once in one transaction.
+        Args:
+            db: AsyncSession
+            workspace_id: Workspace ID; contacts outside it are ignored
+            contact_ids: Contact IDs to tag
+            tags: List of tag names
+            replace: Remove tags not in `tags` instead of only adding
+        Returns:
+            Dict[str, int]: Number of contacts tagged and links added/removed
+        """
+        try:
+            result = await db.execute(
+                select(Contact.id).where(
+                    and_(
+                        Contact.workspace_id == workspace_id,
+                        Contact.id.in_(set(contact_ids))
+                    )
+                )
+            )
+            found = sorted(result.scalars().all())
+
+            added = removed = 0
+            if found:
+                tag_ids = await self._resolve_tags(db, workspace_id, normalize_tag_names(tags))
+                added, removed = await self._sync_contact_tags(
+                    db, found, set(tag_ids.values()), replace=replace
+                )
+                mark_workspaces_dirty(db, [workspace_id])
+            await self._commit(db)
+            return {"contacts": len(found), "added": added, "removed": removed}
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    async def _resolve_tags(
+        self,
+        db: AsyncSession,
+        workspace_id: int,
+        names: List[str]
+    ) -> Dict[str, int]:
+        """
+        Map tag names to IDs with one IN query, upserting missing tags (one
+        multi-row INSERT per chunk) so concurrent callers converge on the
+        same rows.
+        """
+        if not names:
+            return {}
+
+        result = await db.execute(
+            select(Tag.name, Tag.id).where(
+                and_(Tag.workspace_id == workspace_id, Tag.name.in_(names))
+            )
+        )
+        tag_ids = dict(result.all())
+
+        missing = [name for name in names if name not in tag_ids]
+        if missing:
+            ids = await upsert_rows(
+                db,
+                Tag,
+                [{"workspace_id": workspace_id, "name": name} for name in missing],
+                index_elements=["workspace_id", "name"],
+                update_fields=[]
+            )
+            tag_ids.update(zip(missing, ids))
+        return tag_ids
+
+    async def _sync_contact_tags(
+        self,
+        db: AsyncSession,
+        contact_ids: List[int],
+        tag_ids: Set[int],
+        *,
+        replace: bool
+    ) -> Tuple[int, int]:
+        """
+        Insert missing contact_tags links and, when replacing, delete links
+        to other tags. Unchanged links are left alone.
+        Returns:
+            Tuple[int, int]: Links added and removed
+        """
+        result = await db.execute(
+            select(contact_tags.c.contact_id, contact_tags.c.tag_id).where(
+                and_(
+                    contact_tags.c.contact_id.in_(contact_ids),
+                    contact_tags.c.tag_id.isnot(None)
+                )
+            )
+        )
+        current = set(result.all())
+        desired = {(contact_id, tag_id) for contact_id in contact_ids for tag_id in tag_ids}
+
+        to_remove = sorted(current - desired) if replace else []
+        for chunk in _chunks(to_remove, BULK_CHUNK_SIZE):
+            await db.execute(
+                delete(contact_tags).where(
+                    tuple_(contact_tags.c.contact_id, contact_tags.c.tag_id).in_(chunk)
+                )
+            )
+
+        to_add = [
+            {"contact_id": contact_id, "tag_id": tag_id}
+            for contact_id, tag_id in sorted(desired - current)
+        ]
+        dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            # A concurrent call may have linked the same pair since we read
+            stmt = dialect_insert(contact_tags).on_conflict_do_nothing(
+                index_elements=["contact_id", "tag_id"]
+            )
+        else:
+            stmt = insert(contact_tags)
+        for chunk in _chunks(to_add, BULK_CHUNK_SIZE):
+            await db.execute(stmt, chunk)
+
+        return len(to_add), len(to_remove)
+
 contact_service = ContactService()
\ No newline at end of file
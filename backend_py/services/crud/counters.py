@@ -0,0 +1,336 @@
+"""
+Per-workspace dashboard counters.
+
+Task counts by status and priority, open tasks per due day and deal
+counts/values per stage are kept in the workspace_counters table, so the
+dashboard reads a handful of rows instead of scanning tasks and deals.
+
+Every write to a counted model adds the difference between the rows' old
+and new contributions in the same transaction: ORM flushes through the
+after_flush hook below, Core statements in CRUDBase's write methods
+through counted_rows() snapshots and apply_row_changes(). Writes that
+bypass both (raw SQL, other processes) drift the counters until
+rebuild_counters() recomputes them from the source tables.
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event, select, insert, update, delete, func, text, tuple_
+from sqlalchemy import inspect as inspect_state
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from db.database import AsyncSessionLocal
+from db.enums import TaskStatus
+from db.models import Deal, Task, WorkspaceCounter
+
+logger = logging.getLogger(__name__)
+
+# Keys per IN list when snapshotting rows around bulk writes
+SNAPSHOT_CHUNK_SIZE = 500
+
+OPEN_DUE_PREFIX = "tasks.open_due."
+
+CounterDeltas = Dict[Tuple[int, str], float]
+
+def _name(value: Any) -> str:
+    return getattr(value, "value", value)
+
+def _day(value: Any) -> str:
+    """ISO day of a due date (datetime, date or string from DATE())."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+def _task_counters(row: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Counters one task row contributes to. An aggregated row stands for
+    row["count"] tasks with the same values.
+    """
+    count = row.get("count", 1)
+    counters = {"tasks.total": count}
+    if row["status"] is not None:
+        counters[f"tasks.status.{_name(row['status'])}"] = count
+    if row["priority"] is not None:
+        counters[f"tasks.priority.{_name(row['priority'])}"] = count
+    # Same rule as TaskService.get_overdue_tasks: NULL status is not open
+    if (
+        row["status"] is not None
+        and _name(row["status"]) != TaskStatus.COMPLETED.value
+        and row["due_date"] is not None
+    ):
+        counters[OPEN_DUE_PREFIX + _day(row["due_date"])] = count
+    return counters
+
+def _deal_counters(row: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Counters one deal row contributes to. An aggregated row stands for
+    row["count"] deals whose values sum to row["value"].
+    """
+    if row["stage"] is None:
+        return {}
+    stage = _name(row["stage"])
+    return {
+        f"deals.stage.{stage}.count": row.get("count", 1),
+        f"deals.stage.{stage}.value": row["value"] or 0,
+    }
+
+# Counted models: the columns their counters depend on, and the counters
+# a row with those values contributes to
+COUNTED_MODELS: Dict[type, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Dict[str, float]]]] = {
+    Task: (("workspace_id", "status", "priority", "due_date"), _task_counters),
+    Deal: (("workspace_id", "stage", "value"), _deal_counters),
+}
+
+def row_deltas(
+    model,
+    old_rows: Sequence[Dict[str, Any]],
+    new_rows: Sequence[Dict[str, Any]],
+    deltas: Optional[CounterDeltas] = None
+) -> CounterDeltas:
+    """
+    Counter changes for rows of `model` going from old_rows to new_rows
+    (inserts have no old row, deletes no new row).
+    Returns:
+        CounterDeltas: (workspace_id, counter name) -> amount to add
+    """
+    deltas = {} if deltas is None else deltas
+    _, contributions = COUNTED_MODELS[model]
+    for rows, sign in ((old_rows, -1), (new_rows, 1)):
+        for row in rows:
+            if row["workspace_id"] is None:
+                continue
+            for name, amount in contributions(row).items():
+                key = (row["workspace_id"], name)
+                deltas[key] = deltas.get(key, 0) + sign * amount
+    return deltas
+
+def _apply_deltas(session: Session, deltas: CounterDeltas) -> None:
+    """Add deltas to the counters on the session's connection."""
+    rows = [
+        {"workspace_id": workspace_id, "name": name, "value": value}
+        # Sorted so concurrent transactions lock counter rows in the same order
+        for (workspace_id, name), value in sorted(deltas.items())
+        if value
+    ]
+    if not rows:
+        return
+
+    connection = session.connection()
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(WorkspaceCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["workspace_id", "name"],
+            set_={"value": WorkspaceCounter.value + stmt.excluded.value}
+        )
+        connection.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = connection.execute(
+            update(WorkspaceCounter)
+            .where(
+                WorkspaceCounter.workspace_id == row["workspace_id"],
+                WorkspaceCounter.name == row["name"]
+            )
+            .values(value=WorkspaceCounter.value + row["value"])
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(WorkspaceCounter), row)
+
+async def counted_rows(
+    db: AsyncSession,
+    model,
+    values: Sequence[Any],
+    keys: Sequence[str] = ("id",)
+) -> List[Dict[str, Any]]:
+    """
+    Snapshot the counted columns of rows about to be (or just) written,
+    locking them FOR UPDATE so concurrent writers cannot apply the same
+    old state twice.
+    Args:
+        db: AsyncSession
+        model: Counted model
+        values: Key values (tuples when there are several keys)
+        keys: Columns identifying the rows, the primary key by default
+    Returns:
+        List[Dict[str, Any]]: One dict of counted columns per row
+    """
+    columns, _ = COUNTED_MODELS[model]
+    key_columns = [getattr(model, key) for key in keys]
+    target = key_columns[0] if len(key_columns) == 1 else tuple_(*key_columns)
+    query = select(*(getattr(model, column) for column in columns)).with_for_update()
+
+    rows: List[Dict[str, Any]] = []
+    values = list(values)
+    for start in range(0, len(values), SNAPSHOT_CHUNK_SIZE):
+        result = await db.execute(
+            query.where(target.in_(values[start:start + SNAPSHOT_CHUNK_SIZE]))
+        )
+        rows.extend(dict(row) for row in result.mappings())
+    return rows
+
+async def apply_row_changes(
+    db: AsyncSession,
+    model,
+    old_rows: Sequence[Dict[str, Any]],
+    new_rows: Sequence[Dict[str, Any]]
+) -> None:
+    """Update the counters for rows written by a Core statement, without committing."""
+    deltas = row_deltas(model, old_rows, new_rows)
+    if deltas:
+        await db.run_sync(_apply_deltas, deltas)
+
+def _flushed_row(obj, columns: Sequence[str], old: bool) -> Dict[str, Any]:
+    """Counted columns of a flushed instance, before (old) or after the flush."""
+    state = inspect_state(obj)
+    row = {}
+    for column in columns:
+        history = state.attrs[column].history
+        if old and history.has_changes():
+            row[column] = history.deleted[0] if history.deleted else None
+        else:
+            row[column] = getattr(obj, column)
+    return row
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_rows(session, flush_context):
+    # new/dirty/deleted and attribute history still show the pre-flush state
+    deltas: CounterDeltas = {}
+    for objects, old, new in (
+        (session.new, False, True),
+        (session.dirty, True, True),
+        (session.deleted, True, False),
+    ):
+        for obj in objects:
+            spec = COUNTED_MODELS.get(type(obj))
+            if spec is None or (old and new and not session.is_modified(obj)):
+                continue
+            columns, _ = spec
+            row_deltas(
+                type(obj),
+                [_flushed_row(obj, columns, old=True)] if old else [],
+                [_flushed_row(obj, columns, old=False)] if new else [],
+                deltas
+            )
+    if deltas:
+        _apply_deltas(session, deltas)
+
+async def get_counters(
+    db: AsyncSession,
+    workspace_id: int,
+    prefix: Optional[str] = None
+) -> Dict[str, float]:
+    """
+    Read a workspace's counters with one primary key range lookup.
+    Args:
+        db: AsyncSession
+        workspace_id: Workspace ID
+        prefix: Only counters whose name starts with this, e.g. "deals."
+    Returns:
+        Dict[str, float]: Counter name -> value (missing counters are 0)
+    """
+    query = select(WorkspaceCounter.name, WorkspaceCounter.value).where(
+        WorkspaceCounter.workspace_id == workspace_id
+    )
+    if prefix:
+        query = query.where(WorkspaceCounter.name.startswith(prefix, autoescape=True))
+    result = await db.execute(query)
+    return dict(result.tuples().all())
+
+def overdue_count(counters: Dict[str, float], today: Optional[date] = None) -> int:
+    """Open tasks due before today, from the per-day open task counters."""
+    today = (today or date.today()).isoformat()
+    return int(sum(
+        value for name, value in counters.items()
+        if name.startswith(OPEN_DUE_PREFIX) and name[len(OPEN_DUE_PREFIX):] < today
+    ))
+
+async def rebuild_counters(db: AsyncSession, workspace_id: Optional[int] = None) -> int:
+    """
+    Recompute counters from the tasks and deals tables, replacing the
+    stored values, without committing. Writers that touch counters wait
+    until the rebuild commits, so no concurrent change is lost.
+    Args:
+        db: AsyncSession
+        workspace_id: Only rebuild this workspace (all workspaces if None)
+    Returns:
+        int: Number of counter rows written
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("LOCK TABLE workspace_counters IN SHARE ROW EXCLUSIVE MODE"))
+
+    # Deleting first takes SQLite's write lock before the aggregates are read
+    clear = delete(WorkspaceCounter)
+    if workspace_id is not None:
+        clear = clear.where(WorkspaceCounter.workspace_id == workspace_id)
+    await db.execute(clear)
+
+    deltas: CounterDeltas = {}
+    aggregates = (
+        (Task, select(
+            Task.workspace_id, Task.status, Task.priority,
+            func.date(Task.due_date).label("due_date"),
+            func.count().label("count")
+        ).group_by(Task.workspace_id, Task.status, Task.priority, func.date(Task.due_date))),
+        (Deal, select(
+            Deal.workspace_id, Deal.stage,
+            func.sum(Deal.value).label("value"),
+            func.count().label("count")
+        ).group_by(Deal.workspace_id, Deal.stage)),
+    )
+    for model, query in aggregates:
+        if workspace_id is not None:
+            query = query.where(model.workspace_id == workspace_id)
+        result = await db.execute(query)
+        row_deltas(model, [], [dict(row) for row in result.mappings()], deltas)
+
+    rows = [
+        {"workspace_id": counter_workspace, "name": name, "value": value}
+        for (counter_workspace, name), value in sorted(deltas.items())
+        if value
+    ]
+    for start in range(0, len(rows), SNAPSHOT_CHUNK_SIZE):
+        await db.execute(insert(WorkspaceCounter), rows[start:start + SNAPSHOT_CHUNK_SIZE])
+    return len(rows)
+
+async def reconcile_counters(workspace_id: Optional[int] = None) -> int:
+    """
+    Rebuild counters in their own transaction (the reconciliation job).
+    Args:
+        workspace_id: Only rebuild this workspace (all workspaces if None)
+    Returns:
+        int: Number of counter rows written
+    """
+    async with AsyncSessionLocal() as session:
+        rows = await rebuild_counters(session, workspace_id)
+        await session.commit()
+    logger.info("Rebuilt %d workspace counters", rows)
+    return rows
+
+async def run_counter_reconciliation(interval: Optional[int] = None) -> None:
+    """
+    Background loop rebuilding all counters every `interval` seconds
+    (COUNTERS_RECONCILE_INTERVAL by default). An empty counters table,
+    e.g. right after it was created next to existing data, is filled at
+    once.
+    """
+    interval = interval or settings.COUNTERS_RECONCILE_INTERVAL
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(WorkspaceCounter.name).limit(1))
+        empty = result.first() is None
+    if not empty:
+        await asyncio.sleep(interval)
+    while True:
+        try:
+            await reconcile_counters()
+        except Exception:
+            logger.exception("Workspace counter reconciliation failed")
+        await asyncio.sleep(interval)
@@ -2,15 +2,27 @@
 Deal service with specialized deal-related database operations.
 """
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, aliased
 from datetime import datetime
 
 from db.models import Deal, DealStage
 from .base import CRUDBase
+from .cache import cached
+from .counters import get_counters
 
 class DealService(CRUDBase[Deal]):
+    LIST_COLUMNS = (
+        "id", "title", "stage", "value", "currency", "probability",
+        "contact_id", "assigned_to", "closed_at", "created_at", "updated_at",
+    )
+
+    RELATED_COLLECTIONS = {
+        "notes": "created_at",
+        "tasks": "created_at",
+    }
+
     def __init__(self):
         super().__init__(Deal)
 
@@ -18,24 +30,25 @@ class DealService(CRUDBase[Deal]):
         self,
         db: AsyncSession,
         deal_id: int,
-        workspace_id: int
+        workspace_id: int,
+        *,
+        limits: Optional[Dict[str, int]] = None
     ) -> Optional[Deal]:
         """
-        Get deal with all related data.
+        Get deal with its contact and the newest rows of its notes and tasks.
+        Each collection is loaded with its own bounded query; cursors for
+        the rest are in `deal.related_cursors` (see get_related_page).
         Args:
             db: AsyncSession
             deal_id: Deal ID
             workspace_id: Workspace ID for security check
+            limits: Rows to load per relation, defaults to RELATED_PAGE_SIZE
         Returns:
             Optional[Deal]: Found deal with relations or None
         """
         query = (
             select(Deal)
-            .options(
-                joinedload(Deal.contact),
-                joinedload(Deal.notes),
-                joinedload(Deal.tasks)
-            )
+            .options(joinedload(Deal.contact))
             .where(
                 and_(
                     Deal.id == deal_id,
@@ -44,7 +57,10 @@ class DealService(CRUDBase[Deal]):
             )
         )
         result = await db.execute(query)
-        return result.unique().scalar_one_or_none()
+        deal = result.scalar_one_or_none()
+        if deal:
+            await self._load_related(db, deal, limits)
+        return deal
 
     async def get_deals_by_stage(
         self,
@@ -126,31 +142,51 @@ class DealService(CRUDBase[Deal]):
 
         deal.stage = stage
         deal.updated_at = datetime.utcnow()
-        await db.commit()
+        await self._commit(db)
         await db.refresh(deal)
         return deal
 
+    @cached()
     async def get_pipeline_summary(
         self,
         db: AsyncSession,
-        workspace_id: int
+        workspace_id: int,
+        *,
+        aggregate: bool = False,
+        preview_limit: int = 0
     ) -> Dict[str, Any]:
         """
         Get deal pipeline summary with counts and values by stage.
         Args:
             db: AsyncSession
             workspace_id: Workspace ID
+            aggregate: Read counts and values from the workspace counters
+                instead of loading every deal; "deals" then holds only the preview
+            preview_limit: In aggregate mode, most recently updated deals
+                to include per stage (0 for none)
         Returns:
             Dict[str, Any]: Pipeline summary
         """
-        stages = {}
-        for stage in DealStage:
-            deals = await self.get_deals_by_stage(db, workspace_id, stage)
-            stages[stage.value] = {
-                "count": len(deals),
-                "value": sum(deal.value for deal in deals if deal.value),
-                "deals": deals
+        if aggregate:
+            stages = await self._aggregate_stages(db, workspace_id, preview_limit)
+        else:
+            stages = {
+                stage.value: {"count": 0, "value": 0, "deals": []}
+                for stage in DealStage
             }
+            query = (
+                select(Deal)
+                .where(Deal.workspace_id == workspace_id)
+                .order_by(desc(Deal.updated_at))
+            )
+            result = await db.execute(query)
+            for deal in result.scalars().all():
+                if deal.stage is None:
+                    continue
+                data = stages[deal.stage.value]
+                data["count"] += 1
+                data["value"] += deal.value or 0
+                data["deals"].append(deal)
 
         return {
             "total_count": sum(data["count"] for data in stages.values()),
@@ -158,6 +194,50 @@ class DealService(CRUDBase[Deal]):
             "stages": stages
         }
 
+    async def _aggregate_stages(
+        self,
+        db: AsyncSession,
+        workspace_id: int,
+        preview_limit: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read deal counts and values per stage from the workspace counters,
+        plus an optional top-N preview per stage with one windowed query.
+        """
+        counters = await get_counters(db, workspace_id, prefix="deals.stage.")
+        stages = {
+            stage.value: {
+                "count": int(counters.get(f"deals.stage.{stage.value}.count", 0)),
+                "value": counters.get(f"deals.stage.{stage.value}.value", 0),
+                "deals": []
+            }
+            for stage in DealStage
+        }
+
+        if preview_limit > 0:
+            ranked = (
+                select(
+                    Deal,
+                    func.row_number().over(
+                        partition_by=Deal.stage,
+                        order_by=(desc(Deal.updated_at), desc(Deal.id))
+                    ).label("stage_rank")
+                )
+                .where(Deal.workspace_id == workspace_id)
+                .subquery()
+            )
+            ranked_deal = aliased(Deal, ranked)
+            result = await db.execute(
+                select(ranked_deal)
+                .where(ranked.c.stage_rank <= preview_limit)
+                .order_by(ranked.c.stage, ranked.c.stage_rank)
+            )
+            for deal in result.scalars().all():
+                if deal.stage is not None:
+                    stages[deal.stage.value]["deals"].append(deal)
+
+        return stages
+
     async def get_recent_won_deals(
         self,
         db: AsyncSession,
@@ -0,0 +1,68 @@
+"""
+Streaming CSV / NDJSON export of list queries.
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Dict, List, Any
+from sqlalchemy.sql import Select
+
+from app.core.responses import dumps
+from db.database import AsyncSessionLocal
+from .projection import stream_rows
+
+# Export formats and their media types
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched from the server-side cursor per batch
+EXPORT_BATCH_SIZE = 1000
+
+def _encode_csv(rows: List[Dict[str, Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(row.values() for row in rows)
+    return buffer.getvalue().encode()
+
+def _encode_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    return b"".join(dumps(row) + b"\n" for row in rows)
+
+async def export_rows(
+    query: Select,
+    *,
+    format: str = "csv",
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Encode a column select as CSV or NDJSON chunk by chunk.
+    Runs in its own read-only session, since the response body is
+    produced after the request handler has returned.
+    Args:
+        query: Column select, e.g. from CRUDBase.list_query
+        format: "csv" or "ndjson"
+        compress: Gzip the output on the fly
+        batch_size: Rows fetched from the cursor per chunk
+    Yields:
+        bytes: Next chunk of the export
+    """
+    encode = _encode_csv if format == "csv" else _encode_ndjson
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31 = gzip container
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if format == "csv":
+        yield emit(_encode_csv([{c.key: c.key for c in query.selected_columns}]))
+
+    async with AsyncSessionLocal() as session:
+        session.info["route_read_only"] = True
+        async for rows in stream_rows(session, query, batch_size):
+            chunk = emit(encode(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
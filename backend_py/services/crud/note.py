@@ -1,14 +1,22 @@
 """
 Note service with specialized note-related database operations.
 """
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, and_, desc
+import hashlib
+from typing import Optional, List, Dict, Any, Sequence
+import orjson
+from sqlalchemy import select, update, and_, desc, func, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 from db.models import Note, NoteType
 from .base import CRUDBase
+from .cache import mark_workspaces_dirty
+from .search import search_tokens, use_full_text, apply_full_text_search
+
+def content_hash(content: Optional[str]) -> str:
+    """Hash identifying the note content an analysis was made from."""
+    return hashlib.sha256((content or "").encode()).hexdigest()
 
 class NoteService(CRUDBase[Note]):
     def __init__(self):
@@ -53,7 +61,8 @@ class NoteService(CRUDBase[Note]):
         *,
         contact_id: Optional[int] = None,
         deal_id: Optional[int] = None,
-        note_type: Optional[NoteType] = None
+        note_type: Optional[NoteType] = None,
+        limit: Optional[int] = None
     ) -> List[Note]:
         """
         Get notes for a contact or deal with optional type filter.
@@ -63,6 +72,7 @@ class NoteService(CRUDBase[Note]):
             contact_id: Optional contact ID
             deal_id: Optional deal ID
             note_type: Optional note type filter
+            limit: Optional maximum number of (most recent) notes
         Returns:
             List[Note]: List of notes
         """
@@ -78,11 +88,13 @@ class NoteService(CRUDBase[Note]):
         query = (
             select(Note)
             .options(
-                joinedload(Note.created_by)
+                joinedload(Note.user)
             )
             .where(and_(*conditions))
             .order_by(desc(Note.created_at))
         )
+        if limit is not None:
+            query = query.limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -133,7 +145,10 @@ class NoteService(CRUDBase[Note]):
         search_term: str,
         *,
         contact_id: Optional[int] = None,
-        deal_id: Optional[int] = None
+        deal_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        full_text: Optional[bool] = None
     ) -> List[Note]:
         """
         Search notes content.
@@ -143,13 +158,14 @@ class NoteService(CRUDBase[Note]):
             search_term: Term to search for
             contact_id: Optional contact ID filter
             deal_id: Optional deal ID filter
+            limit: Maximum number of notes to return
+            offset: Number of ranked results to skip
+            full_text: Use the full-text index (ranked by relevance) instead
+                of ILIKE; defaults to settings.SEARCH_BACKEND
         Returns:
             List[Note]: List of matching notes
         """
-        conditions = [
-            Note.workspace_id == workspace_id,
-            Note.content.ilike(f"%{search_term}%")
-        ]
+        conditions = [Note.workspace_id == workspace_id]
         
         if contact_id:
             conditions.append(Note.contact_id == contact_id)
@@ -159,14 +175,23 @@ class NoteService(CRUDBase[Note]):
         query = (
             select(Note)
             .options(
-                joinedload(Note.created_by),
+                joinedload(Note.user),
                 joinedload(Note.contact),
                 joinedload(Note.deal)
             )
             .where(and_(*conditions))
-            .order_by(desc(Note.created_at))
         )
-        result = await db.execute(query)
+        tokens = search_tokens(search_term)
+        dialect = db.get_bind().dialect.name
+
+        if use_full_text(full_text, dialect) and tokens:
+            query = apply_full_text_search(query, Note, dialect, tokens)
+        else:
+            query = query.where(
+                Note.content.ilike(f"%{search_term}%")
+            ).order_by(desc(Note.created_at))
+
+        result = await db.execute(query.offset(offset).limit(limit))
         return result.scalars().all()
 
     async def get_recent_notes(
@@ -224,7 +249,218 @@ class NoteService(CRUDBase[Note]):
         note = await self.get_with_relations(db, note_id, workspace_id)
         if not note:
             return None
+        return self.analysis_data(note)
+
+    async def get_notes_for_analysis(
+        self,
+        db: AsyncSession,
+        note_ids: Sequence[int],
+        workspace_id: int
+    ) -> List[Note]:
+        """
+        Get many notes with the contact and deal context AI analysis needs,
+        in one query.
+        Args:
+            db: AsyncSession
+            note_ids: Note IDs
+            workspace_id: Workspace ID for security check
+        Returns:
+            List[Note]: Found notes (IDs of other workspaces are ignored)
+        """
+        query = (
+            select(Note)
+            .options(
+                joinedload(Note.contact),
+                joinedload(Note.deal)
+            )
+            .where(
+                and_(
+                    Note.id.in_(note_ids),
+                    Note.workspace_id == workspace_id
+                )
+            )
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
 
+    async def get_edited_analyzed_notes(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 200
+    ) -> List[Note]:
+        """
+        Get notes edited after their stored AI analysis was made, with the
+        contact and deal context a re-analysis needs. Notes never analyzed
+        are not included.
+        Args:
+            db: AsyncSession
+            limit: Maximum number of notes, least recently analyzed first
+        Returns:
+            List[Note]: Notes whose analysis may be outdated
+        """
+        query = (
+            select(Note)
+            .options(
+                joinedload(Note.contact),
+                joinedload(Note.deal)
+            )
+            .where(
+                and_(
+                    Note.ai_analyzed_at.isnot(None),
+                    Note.updated_at > Note.ai_analyzed_at
+                )
+            )
+            .order_by(Note.ai_analyzed_at)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def save_analyses(
+        self,
+        db: AsyncSession,
+        analyses: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store AI analysis results on their notes, with a hash of the content
+        they were made from so unchanged notes are not re-analyzed. Notes
+        whose content changed since it was read are left alone.
+        Args:
+            db: AsyncSession
+            analyses: Dicts with id, workspace_id, content, summary,
+                sentiment and action_items
+        """
+        if not analyses:
+            return
+        notes = Note.__table__
+        stmt = (
+            update(notes)
+            .where(
+                notes.c.id == bindparam("b_id"),
+                notes.c.content == bindparam("b_content")
+            )
+            .values(
+                ai_summary=bindparam("b_summary"),
+                sentiment=bindparam("b_sentiment"),
+                ai_action_items=bindparam("b_action_items"),
+                ai_content_hash=bindparam("b_hash"),
+                # Same clock as updated_at, so later edits compare greater
+                ai_analyzed_at=func.now(),
+                # Storing an analysis is not an edit of the note
+                updated_at=notes.c.updated_at
+            )
+        )
+        await db.execute(stmt, [
+            {
+                "b_id": analysis["id"],
+                "b_content": analysis["content"],
+                "b_summary": analysis["summary"],
+                "b_sentiment": analysis["sentiment"],
+                "b_action_items": orjson.dumps(analysis.get("action_items") or []).decode(),
+                "b_hash": content_hash(analysis["content"])
+            }
+            for analysis in analyses
+        ])
+        mark_workspaces_dirty(db, {analysis["workspace_id"] for analysis in analyses})
+        await self._commit(db)
+
+    async def get_notes_without_sentiment(
+        self,
+        db: AsyncSession,
+        *,
+        after_id: int = 0,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the content of notes that have no sentiment yet, by ascending ID.
+        Args:
+            db: AsyncSession
+            after_id: Only notes with a greater ID (keyset pagination)
+            limit: Maximum number of notes
+        Returns:
+            List[Dict[str, Any]]: id, workspace_id and content per note
+        """
+        query = (
+            select(Note.id, Note.workspace_id, Note.content)
+            .where(and_(Note.sentiment.is_(None), Note.id > after_id))
+            .order_by(Note.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def save_sentiments(
+        self,
+        db: AsyncSession,
+        sentiments: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store sentiment labels on notes, leaving the rest of a stored
+        analysis alone. Notes whose content changed since it was read are
+        skipped.
+        Args:
+            db: AsyncSession
+            sentiments: Dicts with id, workspace_id, content and sentiment
+        """
+        if not sentiments:
+            return
+        notes = Note.__table__
+        stmt = (
+            update(notes)
+            .where(
+                notes.c.id == bindparam("b_id"),
+                notes.c.content == bindparam("b_content")
+            )
+            .values(
+                sentiment=bindparam("b_sentiment"),
+                # Storing an analysis is not an edit of the note
+                updated_at=notes.c.updated_at
+            )
+        )
+        await db.execute(stmt, [
+            {
+                "b_id": row["id"],
+                "b_content": row["content"],
+                "b_sentiment": row["sentiment"]
+            }
+            for row in sentiments
+        ])
+        mark_workspaces_dirty(db, {row["workspace_id"] for row in sentiments})
+        await self._commit(db)
+
+    def stored_analysis(self, note: Note) -> Dict[str, Any]:
+        """
+        The analysis stored on a note, in the shape AIService.analyze_notes
+        returns.
+        Args:
+            note: Note with a current analysis
+        Returns:
+            Dict[str, Any]: note_id, summary, sentiment, action_items, analyzed_at
+        """
+        return {
+            "note_id": note.id,
+            "summary": note.ai_summary,
+            "sentiment": note.sentiment,
+            "action_items": orjson.loads(note.ai_action_items) if note.ai_action_items else [],
+            "analyzed_at": note.ai_analyzed_at.isoformat() if note.ai_analyzed_at else None
+        }
+
+    def analysis_is_current(self, note: Note) -> bool:
+        """Whether the note's stored analysis was made from its current content."""
+        return (
+            note.ai_summary is not None
+            and note.ai_content_hash == content_hash(note.content)
+        )
+
+    def analysis_data(self, note: Note) -> Dict[str, Any]:
+        """
+        Note content and contact/deal context in the shape AIService expects.
+        Args:
+            note: Note with contact and deal loaded
+        Returns:
+            Dict[str, Any]: Note data with context
+        """
         # Gather context for AI analysis
         context = {
             "note_id": note.id,
@@ -248,7 +484,7 @@ class NoteService(CRUDBase[Note]):
         if note.deal:
             context["context"]["deal"] = {
                 "id": note.deal.id,
-                "name": note.deal.name,
+                "name": note.deal.title,
                 "stage": note.deal.stage.value,
                 "value": note.deal.value
             }
@@ -0,0 +1,109 @@
+"""
+Opaque cursor tokens for keyset pagination.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Tuple
+from sqlalchemy import Date, DateTime, and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+def _to_json(value: Any) -> Any:
+    """Convert a sort key value to a JSON-safe value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def _from_json(value: Any, column) -> Any:
+    """Convert a JSON cursor value back to the column's Python type."""
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class(value)
+    return value
+
+def encode_cursor(sort_key: str, descending: bool, value: Any, id: int) -> str:
+    """
+    Encode the position after a row as an opaque cursor.
+    Args:
+        sort_key: Name of the column the page is ordered by
+        descending: Sort direction
+        value: Sort key value of the last row on the page
+        id: ID of the last row on the page
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps(
+        {"k": sort_key, "d": descending, "v": _to_json(value), "id": id},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(
+    token: str,
+    sort_key: str,
+    descending: bool,
+    column
+) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Args:
+        token: Cursor token
+        sort_key: Column name the caller is ordering by
+        descending: Sort direction the caller is using
+        column: Model column for the sort key
+    Returns:
+        Tuple[Any, int]: Sort key value and ID of the last row seen
+    Raises:
+        ValueError: If the token is malformed or was issued for another ordering
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] != sort_key or payload["d"] != descending:
+            raise ValueError("Cursor was issued for a different ordering")
+        return _from_json(payload["v"], column), int(payload["id"])
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed cursor: {e}")
+
+def keyset_condition(
+    column,
+    id_column,
+    value: Any,
+    last_id: int,
+    descending: bool
+) -> ColumnElement:
+    """
+    Build the WHERE clause selecting rows after (value, last_id).
+    NULL sort values are ordered last in both directions.
+    """
+    if value is None:
+        after_id = id_column < last_id if descending else id_column > last_id
+        return and_(column.is_(None), after_id)
+
+    if descending:
+        return or_(
+            column < value,
+            and_(column == value, id_column < last_id),
+            column.is_(None)
+        )
+    return or_(
+        column > value,
+        and_(column == value, id_column > last_id),
+        column.is_(None)
+    )
+
+def keyset_order(column, id_column, descending: bool) -> Tuple[ColumnElement, ColumnElement]:
+    """Build the ORDER BY matching keyset_condition."""
+    if descending:
+        return column.desc().nulls_last(), id_column.desc()
+    return column.asc().nulls_last(), id_column.asc()
@@ -0,0 +1,90 @@
+"""
+Column projections for list views.
+
+List endpoints select only the columns they render and turn the raw rows
+into JSON-ready dicts, skipping ORM entity construction, the identity map
+and attribute instrumentation.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import Date, DateTime, Enum, Numeric
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+def _number(value: Any) -> Any:
+    return float(value) if isinstance(value, Decimal) else value
+
+def _converter(column) -> Optional[Callable[[Any], Any]]:
+    """JSON conversion for a selected column's values, None if they are JSON-safe."""
+    column_type = getattr(column, "type", None)
+    if isinstance(column_type, Enum):
+        return _enum_value
+    if isinstance(column_type, (DateTime, Date)):
+        return _isoformat
+    if isinstance(column_type, Numeric) and getattr(column_type, "asdecimal", False):
+        return _number
+    return None
+
+def row_converter(query: Select) -> Callable[[Sequence[str], Any], Dict[str, Any]]:
+    """
+    Build a function turning one result row of `query` into a JSON-ready
+    dict. Converters are chosen once per query, not per value.
+    """
+    conversions = [
+        (index, converter)
+        for index, converter in enumerate(map(_converter, query.selected_columns))
+        if converter is not None
+    ]
+
+    def convert(keys: Sequence[str], row: Any) -> Dict[str, Any]:
+        values = list(row)
+        for index, converter in conversions:
+            if values[index] is not None:
+                values[index] = converter(values[index])
+        return dict(zip(keys, values))
+
+    return convert
+
+async def fetch_rows(db: AsyncSession, query: Select) -> List[Dict[str, Any]]:
+    """
+    Execute a column select and return its rows as JSON-ready dicts.
+    Enums become their values and dates ISO strings, so the result can be
+    passed to a JSON response as is.
+    Args:
+        db: AsyncSession
+        query: Select of individual columns (not entities)
+    Returns:
+        List[Dict[str, Any]]: One dict per row, keyed by column label
+    """
+    convert = row_converter(query)
+    result = await db.execute(query)
+    keys = list(result.keys())
+    return [convert(keys, row) for row in result.tuples()]
+
+async def stream_rows(
+    db: AsyncSession,
+    query: Select,
+    batch_size: int = 1000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream a column select through a server-side cursor in batches of
+    JSON-ready dicts, holding at most one batch in memory.
+    Args:
+        db: AsyncSession
+        query: Select of individual columns (not entities)
+        batch_size: Rows fetched from the cursor per batch
+    Yields:
+        List[Dict[str, Any]]: Next batch of rows
+    """
+    convert = row_converter(query)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    keys = list(result.keys())
+    async for partition in result.partitions():
+        yield [convert(keys, row) for row in partition]
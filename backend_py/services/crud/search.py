@@ -0,0 +1,69 @@
+"""
+Ranked full-text search query helpers.
+"""
+import re
+from typing import List, Optional
+from sqlalchemy import func, literal_column, table, column
+from sqlalchemy.sql import Select
+
+from config import settings
+from db.search import fts_table
+
+# Dialects apply_full_text_search supports; others search with ILIKE
+FULL_TEXT_DIALECTS = ("postgresql", "sqlite")
+
+def search_tokens(search_term: str) -> List[str]:
+    """Split a search term into word tokens safe to embed in a match query."""
+    return re.findall(r"\w+", search_term or "")
+
+def use_full_text(full_text: Optional[bool], dialect: str) -> bool:
+    """
+    Resolve an explicit full_text flag against SEARCH_BACKEND. Dialects
+    without full-text support always fall back to ILIKE.
+    """
+    if dialect not in FULL_TEXT_DIALECTS:
+        return False
+    if full_text is not None:
+        return full_text
+    return settings.SEARCH_BACKEND == "fulltext"
+
+def apply_full_text_search(
+    query: Select,
+    model,
+    dialect: str,
+    tokens: List[str]
+) -> Select:
+    """
+    Restrict a select of `model` to rows matching every token (as a prefix)
+    and order them by relevance.
+    Args:
+        query: Select over the model
+        model: Mapped class whose table is in db.search.SEARCH_INDEXES
+        dialect: Database dialect name
+        tokens: Tokens from search_tokens
+    Returns:
+        Select: Filtered and ranked query
+    """
+    table_name = model.__tablename__
+
+    if dialect == "postgresql":
+        vector = literal_column(f"{table_name}.search_vector")
+        ts_query = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in tokens))
+        return (
+            query
+            .where(vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(vector, ts_query).desc(), model.id)
+        )
+
+    if dialect == "sqlite":
+        fts_name = fts_table(table_name)
+        fts = table(fts_name, column("rowid"))
+        match = " ".join(f'"{t}"*' for t in tokens)
+        return (
+            query
+            .join(fts, fts.c.rowid == model.id)
+            .where(literal_column(fts_name).op("MATCH")(match))
+            .order_by(func.bm25(literal_column(fts_name)), model.id)
+        )
+
+    raise ValueError(f"Full-text search is not supported on {dialect}")
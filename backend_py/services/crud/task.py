@@ -9,8 +9,16 @@ from datetime import datetime, date
 
 from db.models import Task, TaskStatus, TaskPriority
 from .base import CRUDBase
+from .cache import cached
+from .counters import get_counters, overdue_count
 
 class TaskService(CRUDBase[Task]):
+    LIST_COLUMNS = (
+        "id", "title", "description", "status", "priority", "category",
+        "due_date", "assigned_to", "contact_id", "deal_id",
+        "created_at", "updated_at",
+    )
+
     def __init__(self):
         super().__init__(Task)
 
@@ -46,6 +54,7 @@ class TaskService(CRUDBase[Task]):
         result = await db.execute(query)
         return result.unique().scalar_one_or_none()
 
+    @cached()
     async def get_user_tasks(
         self,
         db: AsyncSession,
@@ -64,7 +73,7 @@ class TaskService(CRUDBase[Task]):
             List[Task]: List of tasks
         """
         conditions = [
-            Task.assigned_to_id == user_id,
+            Task.assigned_to == user_id,
             Task.workspace_id == workspace_id
         ]
         if status:
@@ -117,6 +126,34 @@ class TaskService(CRUDBase[Task]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_task_counts(
+        self,
+        db: AsyncSession,
+        workspace_id: int
+    ) -> Dict[str, Any]:
+        """
+        Get task counts for the dashboard from the workspace counters,
+        without scanning the tasks table.
+        Args:
+            db: AsyncSession
+            workspace_id: Workspace ID
+        Returns:
+            Dict[str, Any]: total, by_status, by_priority and overdue counts
+        """
+        counters = await get_counters(db, workspace_id, prefix="tasks.")
+        return {
+            "total": int(counters.get("tasks.total", 0)),
+            "by_status": {
+                status.value: int(counters.get(f"tasks.status.{status.value}", 0))
+                for status in TaskStatus
+            },
+            "by_priority": {
+                priority.value: int(counters.get(f"tasks.priority.{priority.value}", 0))
+                for priority in TaskPriority
+            },
+            "overdue": overdue_count(counters)
+        }
+
     async def update_status(
         self,
         db: AsyncSession,
@@ -143,7 +180,7 @@ class TaskService(CRUDBase[Task]):
         task.updated_at = datetime.utcnow()
         if status == TaskStatus.COMPLETED:
             task.completed_at = datetime.utcnow()
-        await db.commit()
+        await self._commit(db)
         await db.refresh(task)
         return task
 
@@ -171,7 +208,7 @@ class TaskService(CRUDBase[Task]):
 
         task.priority = priority
         task.updated_at = datetime.utcnow()
-        await db.commit()
+        await self._commit(db)
         await db.refresh(task)
         return task
 
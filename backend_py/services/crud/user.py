@@ -1,7 +1,7 @@
 """
 User service with specialized user-related database operations.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 
 from db.models import User
 from .base import CRUDBase
+from .cache import cached
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -66,6 +67,48 @@ class UserService(CRUDBase[User]):
 
         return await super().update(db, id=id, obj_in=obj_in)
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[Dict[str, Any]],
+        **kwargs
+    ) -> List[int]:
+        """
+        Create many users, hashing plain passwords.
+        Args:
+            db: AsyncSession
+            objs_in: User data including plain passwords
+        Returns:
+            List[int]: Created user IDs
+        """
+        for obj in objs_in:
+            if 'password' in obj:
+                obj['password'] = pwd_context.hash(obj['password'])
+
+        return await super().create_many(db, objs_in=objs_in, **kwargs)
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[Dict[str, Any]],
+        **kwargs
+    ) -> List[int]:
+        """
+        Update many users, hashing passwords if provided.
+        Args:
+            db: AsyncSession
+            objs_in: Update data, each with "id"
+        Returns:
+            List[int]: Updated user IDs
+        """
+        for obj in objs_in:
+            if 'password' in obj:
+                obj['password'] = pwd_context.hash(obj['password'])
+
+        return await super().update_many(db, objs_in=objs_in, **kwargs)
+
     async def authenticate(
         self,
         db: AsyncSession,
@@ -109,6 +152,7 @@ class UserService(CRUDBase[User]):
         """
         return user.role == "founder"
 
+    @cached()
     async def get_workspace_members(
         self,
         db: AsyncSession,
@@ -2,18 +2,43 @@
 DashboardService: Implements getFounderDashboard, getTeamMemberDashboard, getActivityLogs, getFounderTasks
 """
 from fastapi import HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import read_only
 from db.models import Task, User
 from db.enums import TaskPriority, TaskStatus
+from services.crud import deal_service, task_service
+from services.crud.projection import fetch_rows
 
 class DashboardService:
-    @staticmethod
-    async def get_founder_dashboard(user):
+    @read_only
+    async def get_founder_dashboard(self, user: User, db: AsyncSession):
         """
         Get dashboard data for founder.
+        Task counts, overdue tasks and pipeline value per stage come from
+        the workspace counters, so the cost does not grow with the data.
         """
-        return {"success": True, "data": {}}
+        if not user or not user.workspace_id:
+            raise HTTPException(
+                status_code=400,
+                detail="User or workspace not found"
+            )
+
+        tasks = await task_service.get_task_counts(db, user.workspace_id)
+        pipeline = await deal_service.get_pipeline_summary(db, user.workspace_id, aggregate=True)
+        return {
+            "success": True,
+            "data": {
+                "tasks": tasks,
+                "pipeline": {
+                    "total_count": pipeline["total_count"],
+                    "total_value": pipeline["total_value"],
+                    "stages": {
+                        stage: {"count": data["count"], "value": data["value"]}
+                        for stage, data in pipeline["stages"].items()
+                    }
+                }
+            }
+        }
 
     @staticmethod
     async def get_team_member_dashboard(user):
@@ -29,6 +54,7 @@ class DashboardService:
         """
         return {"success": True, "data": []}
 
+    @read_only
     async def get_founder_tasks(self, user: User, db: AsyncSession):
         """
         Get tasks for founder dashboard.
@@ -43,7 +69,7 @@ class DashboardService:
         try:
             # Query for high priority and urgent tasks that are not completed
             query = (
-                select(Task)
+                task_service.select_columns()
                 .where(
                     Task.workspace_id == user.workspace_id,
                     Task.status != TaskStatus.COMPLETED,
@@ -52,27 +78,7 @@ class DashboardService:
                 .order_by(Task.due_date)
             )
 
-            result = await db.execute(query)
-            tasks = result.scalars().all()
-            
-            # Convert Enum values to strings for JSON serialization
-            task_list = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status.value if task.status else None,
-                    "priority": task.priority.value if task.priority else None,
-                    "category": task.category,
-                    "due_date": task.due_date.isoformat() if task.due_date else None,
-                    "assigned_to": task.assigned_to,
-                    "contact_id": task.contact_id,
-                    "deal_id": task.deal_id,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-                }
-                for task in tasks
-            ]
+            task_list = await fetch_rows(db, query)
 
             return {
                 "success": True,
@@ -88,6 +94,7 @@ class DashboardService:
                 detail=f"Error retrieving founder tasks: {str(e)}"
             )
 
+    @read_only
     async def get_team_member_tasks(self, user: User, db: AsyncSession):
         """
         Get tasks for team member dashboard.
@@ -102,7 +109,7 @@ class DashboardService:
         try:
             # Query for tasks assigned to the team member that are not completed
             query = (
-                select(Task)
+                task_service.select_columns()
                 .where(
                     Task.workspace_id == user.workspace_id,
                     Task.assigned_to == user.id,
@@ -111,27 +118,7 @@ class DashboardService:
                 .order_by(Task.due_date)
             )
 
-            result = await db.execute(query)
-            tasks = result.scalars().all()
-            
-            # Convert Enum values to strings for JSON serialization
-            task_list = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status.value if task.status else None,
-                    "priority": task.priority.value if task.priority else None,
-                    "category": task.category,
-                    "due_date": task.due_date.isoformat() if task.due_date else None,
-                    "assigned_to": task.assigned_to,
-                    "contact_id": task.contact_id,
-                    "deal_id": task.deal_id,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-                }
-                for task in tasks
-            ]
+            task_list = await fetch_rows(db, query)
 
             return {
                 "success": True,
@@ -2,15 +2,56 @@
 DealService: Implements getDeals, getDealsByPipeline, getDeal, createDeal, updateDeal, updateDealStage, deleteDeal
 """
 from fastapi import HTTPException, status
+from db.enums import DealStage
+from services.crud import deal_service
+from services.crud.export import EXPORT_FORMATS, export_rows
+from app.core.responses import export_response
 
 class DealService:
     @staticmethod
-    async def get_deals(user, stage=None):
+    async def get_deals(user, db, stage=None, limit=100, offset=0):
         """
-        Get all deals for workspace.
-        TODO: Implement DB logic using SQLAlchemy async.
+        Get all deals for workspace, most recently created first.
+        Returns list columns only, as plain rows.
         """
-        return {"success": True, "data": []}
+        rows = await deal_service.get_rows(
+            db,
+            filters=DealService._list_filters(user, stage),
+            order_by="created_at",
+            descending=True,
+            skip=offset,
+            limit=limit
+        )
+        return {"success": True, "data": rows}
+
+    @staticmethod
+    def export_deals(user, format="csv", compress=False, stage=None):
+        """
+        Stream all matching deals as a CSV or NDJSON download.
+        Takes the same filters as get_deals.
+        """
+        query = deal_service.list_query(
+            filters=DealService._list_filters(user, stage),
+            order_by="created_at",
+            descending=True
+        )
+        return export_response(
+            export_rows(query, format=format, compress=compress),
+            media_type=EXPORT_FORMATS[format],
+            filename=f"deals.{format}",
+            compressed=compress
+        )
+
+    @staticmethod
+    def _list_filters(user, stage):
+        """Filters for the deal list and export, parsed from query values."""
+        filters = {"workspace_id": user.workspace_id}
+        if stage:
+            try:
+                filters["stage"] = DealStage(stage)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return filters
 
     @staticmethod
     async def get_deals_by_pipeline(user):
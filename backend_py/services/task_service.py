@@ -7,16 +7,62 @@ from sqlalchemy.orm import selectinload
 from typing import List
 from db import get_db
 from db.models import Task, User
-from db.enums import TaskStatus, UserRole
+from db.enums import TaskStatus, TaskPriority, UserRole
+from services.crud import task_service
+from services.crud.export import EXPORT_FORMATS, export_rows
+from app.core.responses import export_response
 
 class TaskService:
     @staticmethod
-    async def get_tasks(user, status=None, assigned_to=None, category=None, priority=None):
-        """
-        Get all tasks for workspace.
-        TODO: Implement DB logic using SQLAlchemy async.
-        """
-        return {"success": True, "data": []}
+    async def get_tasks(user, db, status=None, assigned_to=None, category=None, priority=None,
+                        limit=100, offset=0):
+        """
+        Get all tasks for workspace, newest first.
+        Returns list columns only, as plain rows.
+        """
+        rows = await task_service.get_rows(
+            db,
+            filters=TaskService._list_filters(user, status, assigned_to, category, priority),
+            order_by="created_at",
+            descending=True,
+            skip=offset,
+            limit=limit
+        )
+        return {"success": True, "data": rows}
+
+    @staticmethod
+    def export_tasks(user, format="csv", compress=False, status=None, assigned_to=None,
+                     category=None, priority=None):
+        """
+        Stream all matching tasks as a CSV or NDJSON download.
+        Takes the same filters as get_tasks.
+        """
+        query = task_service.list_query(
+            filters=TaskService._list_filters(user, status, assigned_to, category, priority),
+            order_by="created_at",
+            descending=True
+        )
+        return export_response(
+            export_rows(query, format=format, compress=compress),
+            media_type=EXPORT_FORMATS[format],
+            filename=f"tasks.{format}",
+            compressed=compress
+        )
+
+    @staticmethod
+    def _list_filters(user, status, assigned_to, category, priority):
+        """Filters for the task list and export, parsed from query values."""
+        try:
+            filters = {
+                "workspace_id": user.workspace_id,
+                "status": TaskStatus(status) if status else None,
+                "assigned_to": assigned_to,
+                "category": category,
+                "priority": TaskPriority(priority) if priority else None,
+            }
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {k: v for k, v in filters.items() if v is not None}
 
     @staticmethod
     async def get_my_tasks(user):